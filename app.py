@@ -6,7 +6,11 @@ import sqlite3
 import plotly.graph_objects as go
 import numpy as np
 import os
+from contextlib import closing
 from config import *
+from layout import add_layout_columns, get_node_positions, stored_node_positions
+from network_store import edges_query
+from enhanced_network_generator import EnhancedStreamlitDatabaseGenerator
 import time
 
 # --- Page Configuration ---
@@ -48,25 +52,72 @@ def load_css(file_name):
 load_css('style.css')
 
 # --- Data Loading ---
+def get_data_source():
+    """Name the files load_database reads: Parquet first, then the SQLite database, then CSV (None if there are none)"""
+    # Parquet is the preferred source: columnar, typed, and read without a SQL round trip
+    if os.path.exists(NODES_PARQUET_PATH):
+        return 'parquet'
+    if os.path.exists(DATABASE_PATH):
+        return 'sqlite'
+    if os.path.exists(NODES_CSV_PATH):
+        return 'csv'
+    return None
+
 @st.cache_data(ttl=CACHE_TTL)
-def load_database():
-    """Load data from database or CSV files"""
+def load_database(data_version):
+    """Load data from Parquet, database or CSV files; data_version keys the cache so new files are picked up"""
+    data_source = get_data_source()
     try:
-        if os.path.exists(DATABASE_PATH):
-            conn = sqlite3.connect(DATABASE_PATH)
-            nodes_df = pd.read_sql('SELECT * FROM nodes', conn)
-            edges_df = pd.read_sql('SELECT * FROM edges', conn)
-            summary_df = pd.read_sql('SELECT * FROM network_summary', conn)
-            conn.close()
-            return nodes_df, edges_df, summary_df
-        else:
+        if data_source == 'parquet':
+            nodes_df = pd.read_parquet(NODES_PARQUET_PATH, engine='pyarrow', columns=NODE_COLUMNS)
+            edges_df = pd.read_parquet(EDGES_PARQUET_PATH, engine='pyarrow', dtype_backend='pyarrow')
+            summary_df = pd.read_parquet(SUMMARY_PARQUET_PATH, engine='pyarrow')
+        elif data_source == 'sqlite':
+            # A connection of its own: the loader runs once per cache entry, so sessions never share a cursor
+            with closing(sqlite3.connect(DATABASE_PATH)) as conn:
+                nodes_df = pd.read_sql(NODES_QUERY, conn)
+                # Edges are all short strings; Arrow-backed columns run the string filters in C++
+                edges_df = pd.read_sql(edges_query(conn), conn, dtype_backend='pyarrow')
+                summary_df = pd.read_sql('SELECT * FROM network_summary', conn)
+        elif data_source == 'csv':
             nodes_df = pd.read_csv(NODES_CSV_PATH)
-            edges_df = pd.read_csv(EDGES_CSV_PATH)
+            edges_df = pd.read_csv(EDGES_CSV_PATH, dtype_backend='pyarrow')
             summary_df = pd.read_csv(SUMMARY_CSV_PATH)
-            return nodes_df, edges_df, summary_df
+        else:
+            nodes_df, edges_df, summary_df = build_database(GENERATOR_SEED, GENERATOR_VERSION)
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return create_sample_data()
+        nodes_df, edges_df, summary_df = create_sample_data()
+    return nodes_df, index_edges(edges_df), summary_df
+
+@st.cache_data(persist="disk")
+def build_database(seed, version):
+    """Generate the database in-process when no data files exist; cached on disk per (seed, version)"""
+    generator = EnhancedStreamlitDatabaseGenerator(seed=seed)
+    nodes_df, edges_df, summary_df = generator.generate_complete_database()
+    return add_layout_columns(nodes_df), edges_df, summary_df
+
+def index_edges(edges_df):
+    """Index edges by (network_id, edge_type) so lookups use the sorted index instead of masks"""
+    return edges_df.set_index(['network_id', 'edge_type']).sort_index()
+
+def select_edges(edges_df, network_id, edge_type=None):
+    """Return the edges of a network, optionally of a single type, via the edge index"""
+    key = network_id if edge_type is None else (network_id, edge_type)
+    if key not in edges_df.index:
+        return edges_df.iloc[:0]
+    return edges_df.loc[[key]]
+
+def get_data_version():
+    """Identify the current data files so figures built from older data are not reused"""
+    data_source = get_data_source()
+    if data_source == 'parquet':
+        data_paths = [NODES_PARQUET_PATH, EDGES_PARQUET_PATH]
+    elif data_source == 'sqlite':
+        data_paths = [DATABASE_PATH]
+    else:
+        data_paths = [NODES_CSV_PATH, EDGES_CSV_PATH]
+    return tuple(os.path.getmtime(path) for path in data_paths if os.path.exists(path))
 
 def create_sample_data():
     """Create fallback sample data"""
@@ -97,95 +148,73 @@ def create_sample_data():
     
     return nodes_df, edges_df, summary_df
 
-# --- Visualization Functions ---
-
-def get_node_positions(network_nodes, network_id):
-    """Calculate node positions based on node type."""
-    node_positions = {}
-    np.random.seed(42 + network_id)
-
-    # Position grant
-    grants = network_nodes[network_nodes['node_type'] == NODE_TYPE_GRANT]
-    if not grants.empty:
-        node_positions[grants.iloc[0]['node_id']] = (NODE_POSITIONS_X['grant'], NODE_POSITIONS_Y['grant'])
-
-    # Position publications
-    publications = network_nodes[network_nodes['node_type'] == NODE_TYPE_PUBLICATION]
-    grant_funded_pubs = [p for p in publications['node_id'] if p.startswith('PUB_')]
-    treatment_pathway_pubs = [p for p in publications['node_id'] if p.startswith('TREAT_PUB_')]
-    ecosystem_pubs = [p for p in publications['node_id'] if p.startswith('ECO_')]
-
-    for i, pub_id in enumerate(grant_funded_pubs):
-        node_positions[pub_id] = (NODE_POSITIONS_X['grant_funded_pub'], NODE_POSITIONS_Y['grant_funded_pub'][i % len(NODE_POSITIONS_Y['grant_funded_pub'])])
-
-    for i, pub_id in enumerate(treatment_pathway_pubs):
-        node_positions[pub_id] = (NODE_POSITIONS_X['treatment_pathway_pub'], NODE_POSITIONS_Y['treatment_pathway_pub'][i % len(NODE_POSITIONS_Y['treatment_pathway_pub'])])
-
-    # --- Ecosystem publications positioned by year ---
-    ecosystem_pubs_df = publications[publications['node_id'].str.startswith('ECO_')]
-
-    if not ecosystem_pubs_df.empty:
-        min_year = ecosystem_pubs_df['year'].min()
-        max_year = ecosystem_pubs_df['year'].max()
-
-        for _, node in ecosystem_pubs_df.iterrows():
-            year = node.get('year', np.nan)
-
-            if pd.notna(year):
-                # Map publication year to horizontal position between grant and treatment areas
-                x_pos = np.interp(
-                    year,
-                    [min_year, max_year],
-                    [NODE_POSITIONS_X['grant_funded_pub'] + 0.5,
-                     NODE_POSITIONS_X['treatment_pathway_pub'] - 0.5]
-                )
-            else:
-                # Fallback for missing year
-                x_pos = np.random.uniform(
-                    NODE_POSITIONS_X['grant_funded_pub'] + 0.5,
-                    NODE_POSITIONS_X['treatment_pathway_pub'] - 0.5
-                )
-
-            # Add small vertical jitter for natural dispersion
-            y_pos = np.random.uniform(-1.5, 1.5)
-
-            node_positions[node['node_id']] = (
-                x_pos + np.random.normal(0, 0.2),
-                y_pos + np.random.normal(0, 0.2)
-            )
+@st.cache_data(ttl=CACHE_TTL)
+def index_summary(summary_df):
+    """Map each searchable column value to the summary rows it selects"""
+    return {
+        column: {value: list(rows) for value, rows in summary_df.groupby(column).groups.items()}
+        for column in SEARCH_COLUMNS.values()
+    }
 
+@st.cache_data(ttl=CACHE_TTL)
+def load_metrics(data_version):
+    """Read the statistics precomputed by the generator, or None unless the data was loaded from a database that has them"""
+    # Metrics describing the database would not match data loaded from Parquet or CSV files
+    if get_data_source() != 'sqlite':
+        return None
+    try:
+        with closing(sqlite3.connect(DATABASE_PATH)) as conn:
+            metrics_df = pd.read_sql('SELECT * FROM metrics', conn)
+    except Exception:
+        return None
+    if metrics_df.empty:
+        return None
+    return {column: int(value) for column, value in metrics_df.iloc[0].items()}
 
-    # Position treatment
-    treatments = network_nodes[network_nodes['node_type'] == NODE_TYPE_TREATMENT]
-    if not treatments.empty:
-        node_positions[treatments.iloc[0]['node_id']] = (NODE_POSITIONS_X['treatment'], NODE_POSITIONS_Y['treatment'])
+@st.cache_data(ttl=CACHE_TTL)
+def compute_edge_statistics(_edges_df, data_version):
+    """Count the edges shown in the sidebar statistics once per data version"""
+    return {
+        'total_connections': len(_edges_df),
+        'treatment_pathways': int(np.count_nonzero(_edges_df.index.get_level_values('edge_type') == EDGE_TYPE_LEADS_TO_TREATMENT)),
+    }
 
-    return node_positions
+# --- Visualization Functions ---
+# Legend order of the traces; the background is drawn first (underneath), so the legend is ranked explicitly
+LEGEND_RANKS = {name: rank for rank, name in enumerate([
+    'Grant Funding', 'Research Impact Pathway', 'Citation', 'Treatment Enablement', 'Grant',
+    'Grant-Funded Papers', 'Treatment Approval Papers', 'Research Ecosystem', 'Approved Treatment'
+], 1)}
 
 def create_edge_trace(edges, node_positions, edge_type, name, showlegend):
-    """Create a Plotly scatter trace for edges."""
-    edge_x, edge_y = [], []
-    for _, edge in edges.iterrows():
-        if edge['source_id'] in node_positions and edge['target_id'] in node_positions:
-            x0, y0 = node_positions[edge['source_id']]
-            x1, y1 = node_positions[edge['target_id']]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-    
-    if not edge_x:
+    """Create a WebGL scatter trace for edges."""
+    # Keep edges whose endpoints are both laid out
+    edges = edges[edges['source_id'].isin(node_positions.keys()) & edges['target_id'].isin(node_positions.keys())]
+    if edges.empty:
         return None
 
-    return go.Scatter(
+    source_xy = np.array([node_positions[node_id] for node_id in edges['source_id']], dtype=np.float32)
+    target_xy = np.array([node_positions[node_id] for node_id in edges['target_id']], dtype=np.float32)
+
+    # All edges of this type form one NaN-separated line: x0, x1, NaN, x0, x1, NaN, ...
+    # Single precision is plenty for screen coordinates and halves the encoded array payload
+    edge_x = np.full(3 * len(edges), np.nan, dtype=np.float32)
+    edge_y = np.full(3 * len(edges), np.nan, dtype=np.float32)
+    edge_x[0::3], edge_x[1::3] = source_xy[:, 0], target_xy[:, 0]
+    edge_y[0::3], edge_y[1::3] = source_xy[:, 1], target_xy[:, 1]
+
+    return go.Scattergl(
         x=edge_x, y=edge_y,
         line=dict(width=EDGE_WIDTHS[edge_type], color=EDGE_COLORS[edge_type]),
         hoverinfo='none',
         mode='lines',
         name=name,
+        legendrank=LEGEND_RANKS[name],
         showlegend=showlegend
     )
 
 def create_node_trace(nodes, node_positions, node_type, name, text_template, showlegend):
-    """Create a Plotly scatter trace for nodes with detailed hover text."""
+    """Create a WebGL scatter trace for nodes with detailed hover text."""
     node_x, node_y, hover_texts = [], [], []
 
     for _, node in nodes.iterrows():
@@ -246,7 +275,7 @@ def create_node_trace(nodes, node_positions, node_type, name, text_template, sho
 
         hover_texts.append(hover_text)
 
-    return go.Scatter(
+    return go.Scattergl(
         x=node_x, y=node_y,
         mode='markers',
         hoverinfo='text',
@@ -255,14 +284,61 @@ def create_node_trace(nodes, node_positions, node_type, name, text_template, sho
                     color=NODE_COLORS[node_type],
                     line=dict(width=2, color='#e2e8f0')),
         name=name,
+        legendrank=LEGEND_RANKS[name],
         showlegend=showlegend
     )
 
 
-def create_network_visualization(nodes_df, edges_df, network_id, grant_id=None, treatment_name=None):
-    """Create the network visualization."""
+def prepare_network(nodes_df, edges_df, network_id):
+    """Select a network's nodes and edges, lay it out and split its edges by type."""
     network_nodes = nodes_df[nodes_df['network_id'] == network_id]
-    network_edges = edges_df[edges_df['network_id'] == network_id]
+    network_edges = select_edges(edges_df, network_id)
+
+    # Use the layout stored by the generator when the data has one
+    node_positions = stored_node_positions(network_nodes)
+    if node_positions is None:
+        node_positions = get_node_positions(network_nodes, network_id)
+
+    # Split edges by type in a single grouping pass instead of one mask per type
+    edges_by_type = dict(tuple(network_edges.groupby(level='edge_type', sort=False)))
+
+    return network_nodes, network_edges, edges_by_type, node_positions
+
+def build_core_traces(network_nodes, network_edges, edges_by_type, node_positions):
+    """Create the grant → treatment pathway traces, which are cheap and rendered first."""
+    no_edges = network_edges.iloc[:0]
+
+    # A network without edges still shows its nodes
+    edge_traces = [] if network_edges.empty else [
+        create_edge_trace(edges_by_type.get(edge_type, no_edges), node_positions, edge_type, name, showlegend)
+        for edge_type, name, showlegend in [
+            (EDGE_TYPE_FUNDED_BY, 'Grant Funding', True),
+            (EDGE_TYPE_LEADS_TO_TREATMENT, 'Research Impact Pathway', True),
+            (EDGE_TYPE_ENABLES_TREATMENT, 'Treatment Enablement', True),
+        ]
+    ]
+
+    node_traces = [
+        create_node_trace(network_nodes[network_nodes['node_type'] == NODE_TYPE_GRANT], node_positions, NODE_TYPE_GRANT, 'Grant', 'Research Grant<br>Funding Source', True),
+        create_node_trace(network_nodes[network_nodes['node_id'].str.startswith('PUB_')], node_positions, 'grant_funded_pub', 'Grant-Funded Papers', 'Grant-Funded Paper', True),
+        create_node_trace(network_nodes[network_nodes['node_id'].str.startswith('TREAT_PUB_')], node_positions, 'treatment_pathway_pub', 'Treatment Approval Papers', 'Treatment Development Paper', True),
+        create_node_trace(network_nodes[network_nodes['node_type'] == NODE_TYPE_TREATMENT], node_positions, NODE_TYPE_TREATMENT, 'Approved Treatment', 'Approved Treatment<br>Clinical Application', True),
+    ]
+
+    return edge_traces + node_traces
+
+def build_background_traces(network_nodes, network_edges, edges_by_type, node_positions):
+    """Create the citation and ecosystem traces, which hold the bulk of the figure data."""
+    citation_traces = [] if network_edges.empty else [
+        create_edge_trace(edges_by_type.get(EDGE_TYPE_CITES, network_edges.iloc[:0]), node_positions, EDGE_TYPE_CITES, 'Citation', False),
+    ]
+    return citation_traces + [
+        create_node_trace(network_nodes[network_nodes['node_id'].str.startswith('ECO_')], node_positions, 'ecosystem_pub', 'Research Ecosystem', 'Research Ecosystem<br>Supporting Literature', True),
+    ]
+
+def create_network_visualization(nodes_df, edges_df, network_id, grant_id=None, treatment_name=None):
+    """Create the network visualization without the citation background (see add_background_traces)."""
+    network_nodes, network_edges, edges_by_type, node_positions = prepare_network(nodes_df, edges_df, network_id)
 
     if network_nodes.empty:
         st.error(f"No data found for network {network_id}")
@@ -277,24 +353,9 @@ def create_network_visualization(nodes_df, edges_df, network_id, grant_id=None,
         treatment_node = network_nodes[network_nodes['node_type'] == NODE_TYPE_TREATMENT]
         treatment_name = treatment_node.iloc[0]['node_id'] if not treatment_node.empty else "Treatment"
 
-    node_positions = get_node_positions(network_nodes, network_id)
-
-    edge_traces = [
-        create_edge_trace(network_edges[network_edges['edge_type'] == EDGE_TYPE_FUNDED_BY], node_positions, EDGE_TYPE_FUNDED_BY, 'Grant Funding', True),
-        create_edge_trace(network_edges[network_edges['edge_type'] == EDGE_TYPE_LEADS_TO_TREATMENT], node_positions, EDGE_TYPE_LEADS_TO_TREATMENT, 'Research Impact Pathway', True),
-        create_edge_trace(network_edges[network_edges['edge_type'] == EDGE_TYPE_CITES], node_positions, EDGE_TYPE_CITES, 'Citation', False),
-        create_edge_trace(network_edges[network_edges['edge_type'] == EDGE_TYPE_ENABLES_TREATMENT], node_positions, EDGE_TYPE_ENABLES_TREATMENT, 'Treatment Enablement', True),
-    ]
+    traces = build_core_traces(network_nodes, network_edges, edges_by_type, node_positions)
 
-    node_traces = [
-        create_node_trace(network_nodes[network_nodes['node_type'] == NODE_TYPE_GRANT], node_positions, NODE_TYPE_GRANT, 'Grant', 'Research Grant<br>Funding Source', True),
-        create_node_trace(network_nodes[network_nodes['node_id'].str.startswith('PUB_')], node_positions, 'grant_funded_pub', 'Grant-Funded Papers', 'Grant-Funded Paper', True),
-        create_node_trace(network_nodes[network_nodes['node_id'].str.startswith('TREAT_PUB_')], node_positions, 'treatment_pathway_pub', 'Treatment Approval Papers', 'Treatment Development Paper', True),
-        create_node_trace(network_nodes[network_nodes['node_id'].str.startswith('ECO_')], node_positions, 'ecosystem_pub', 'Research Ecosystem', 'Research Ecosystem<br>Supporting Literature', True),
-        create_node_trace(network_nodes[network_nodes['node_type'] == NODE_TYPE_TREATMENT], node_positions, NODE_TYPE_TREATMENT, 'Approved Treatment', 'Approved Treatment<br>Clinical Application', True),
-    ]
-
-    fig = go.Figure(data=[t for t in edge_traces + node_traces if t is not None])
+    fig = go.Figure(data=[t for t in traces if t is not None])
 
     fig.update_layout(
         title={'text': f"Research Impact Network - {grant_id} → {treatment_name}", 'x': 0.5, 'xanchor': 'center', 'font': {'size': 20, 'color': '#e2e8f0', 'family': 'Inter, sans-serif'}},
@@ -317,11 +378,43 @@ def create_network_visualization(nodes_df, edges_df, network_id, grant_id=None,
     )
     return fig
 
+def add_background_traces(core_fig, nodes_df, edges_df, network_id):
+    """Return a new figure with the citation background added to a pathway figure, reusing its traces and layout."""
+    network_nodes, network_edges, edges_by_type, node_positions = prepare_network(nodes_df, edges_df, network_id)
+    if network_nodes.empty:
+        return go.Figure(core_fig)
+
+    background = build_background_traces(network_nodes, network_edges, edges_by_type, node_positions)
+    # Background goes first so the pathway stays drawn on top of it
+    return go.Figure(data=[t for t in background if t is not None] + list(core_fig.data), layout=core_fig.layout)
+
+@st.cache_resource(ttl=CACHE_TTL)
+def get_network_figure(_nodes_df, _edges_df, network_id, data_version, grant_id=None, treatment_name=None, include_background=True):
+    """Build a network figure once per network and data version and share it across reruns and sessions"""
+    if include_background:
+        # The full figure extends the cached pathway figure, so the pathway is only built once
+        core_fig = get_network_figure(_nodes_df, _edges_df, network_id, data_version, grant_id=grant_id,
+                                      treatment_name=treatment_name, include_background=False)
+        return add_background_traces(core_fig, _nodes_df, _edges_df, network_id)
+    return create_network_visualization(_nodes_df, _edges_df, network_id, grant_id=grant_id,
+                                        treatment_name=treatment_name)
+
 # --- UI Components ---
+SEARCH_COLUMNS = {
+    "Disease": 'disease',
+    "Treatment": 'treatment_name',
+    "Grant": 'grant_id',
+}
+
+@st.cache_data(ttl=CACHE_TTL)
+def get_network_summary(_summary_df, network_id, data_version):
+    """Look up the summary row of a network once per data version"""
+    return _summary_df[_summary_df['network_id'] == network_id].iloc[0].to_dict()
+
 def display_network_metrics(summary_df, edges_df, network_id):
     """Display key metrics for the selected network"""
     try:
-        network_summary = summary_df[summary_df['network_id'] == network_id].iloc[0]
+        network_summary = get_network_summary(summary_df, network_id, get_data_version())
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -342,12 +435,14 @@ def main():
     st.markdown('<h1 class="main-header">Research Impact Network Analysis</h1>', unsafe_allow_html=True)
     st.markdown('<p style="text-align: center; font-size: 1.1rem; color: #a0aec0; margin-bottom: 3rem; font-weight: 300;">Mapping Research Pathways from Grant Funding to Breakthrough Treatments</p>', unsafe_allow_html=True)
 
-    # Load data
-    nodes_df, edges_df, summary_df = load_database()
+    # Load data and its statistics from the same files
+    data_version = get_data_version()
+    nodes_df, edges_df, summary_df = load_database(data_version)
 
+    edge_stats = load_metrics(data_version) or compute_edge_statistics(edges_df, data_version)
     st.sidebar.markdown("### Database Statistics")
-    st.sidebar.write(f"Total connections: {len(edges_df)}")
-    st.sidebar.write(f"Treatment pathways: {len(edges_df[edges_df['edge_type'] == EDGE_TYPE_LEADS_TO_TREATMENT])}")
+    st.sidebar.write(f"Total connections: {edge_stats['total_connections']}")
+    st.sidebar.write(f"Treatment pathways: {edge_stats['treatment_pathways']}")
 
     if summary_df.empty:
         st.error("No data available. Please check your database files.")
@@ -378,15 +473,12 @@ def main():
         
         st.markdown('</div>', unsafe_allow_html=True)
 
+    # Resolve the selection once through the cached index; reused below to verify the selected network
+    summary_index = index_summary(summary_df)
+    filtered_networks = summary_df.loc[summary_index[SEARCH_COLUMNS[search_type]].get(selected_search, [])]
+
     # Only show networks if a search selection has been made
     if selected_search and selected_search != "":
-        if search_type == "Disease":
-            filtered_networks = summary_df[summary_df['disease'] == selected_search]
-        elif search_type == "Treatment":
-            filtered_networks = summary_df[summary_df['treatment_name'] == selected_search]
-        else:  # Grant
-            filtered_networks = summary_df[summary_df['grant_id'] == selected_search]
-
         if not filtered_networks.empty:
             st.markdown("### Available Research Networks")
             
@@ -429,14 +521,8 @@ def main():
         
         # Verify the network still exists in the current filtered data
         if selected_search and selected_search != "":
-            # Use filtered networks
-            if search_type == "Disease":
-                current_networks = summary_df[summary_df['disease'] == selected_search]
-            elif search_type == "Treatment":
-                current_networks = summary_df[summary_df['treatment_name'] == selected_search]
-            else:  # Grant
-                current_networks = summary_df[summary_df['grant_id'] == selected_search]
-            
+            current_networks = filtered_networks
+
             if network_id in current_networks['network_id'].values:
                 selected_summary = current_networks[current_networks['network_id'] == network_id].iloc[0]
                 
@@ -444,26 +530,41 @@ def main():
                 display_network_metrics(summary_df, edges_df, network_id)
 
                 st.markdown("### 🕸️ Research Network Visualization")
-                with st.spinner("Creating network visualization..."):
-                    fig = create_network_visualization(nodes_df, edges_df, network_id, 
-                                                     grant_id=selected_summary['grant_id'], 
+                fig_key = (network_id, data_version)
+                if st.session_state.get('last_fig_key') == fig_key:
+                    # Only widgets changed since the last render, so draw the cached full figure directly
+                    fig = get_network_figure(nodes_df, edges_df, network_id, data_version,
+                                             grant_id=selected_summary['grant_id'],
+                                             treatment_name=selected_summary['treatment_name'])
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    with st.spinner("Creating network visualization..."):
+                        # Paint the pathway first, then replace it with the full figure once the background is built
+                        chart = st.empty()
+                        fig = get_network_figure(nodes_df, edges_df, network_id, data_version,
+                                                 grant_id=selected_summary['grant_id'],
+                                                 treatment_name=selected_summary['treatment_name'],
+                                                 include_background=False)
+                        if fig.data:
+                            chart.plotly_chart(fig, use_container_width=True)
+                            fig = get_network_figure(nodes_df, edges_df, network_id, data_version,
+                                                     grant_id=selected_summary['grant_id'],
                                                      treatment_name=selected_summary['treatment_name'])
-                    if fig.data:
-                        st.plotly_chart(fig, use_container_width=True)
-                    else:
-                        st.error("Unable to create network visualization")
+                            chart.plotly_chart(fig, use_container_width=True)
+                            st.session_state.last_fig_key = fig_key
+                        else:
+                            st.error("Unable to create network visualization")
                 # --- Citation Explorer Section ---
                 st.markdown("### 🔍 Explore Direct Citations Between Publications")
                 
                 # Get the network’s ecosystem and treatment-pathway papers
                 network_nodes = nodes_df[nodes_df['network_id'] == network_id]
-                network_edges = edges_df[edges_df['network_id'] == network_id]
+                citation_edges = select_edges(edges_df, network_id, EDGE_TYPE_CITES)
                 
                 # Identify direct citation edges (ecosystem or treatment papers citing funded ones)
-                direct_citations = network_edges[
-                    (network_edges['edge_type'] == EDGE_TYPE_CITES) &
-                    (network_edges['target_id'].str.startswith('PUB_')) &
-                    (network_edges['source_id'].str.startswith(('ECO_', 'TREAT_PUB_')))
+                direct_citations = citation_edges[
+                    (citation_edges['target_id'].str.startswith('PUB_')) &
+                    (citation_edges['source_id'].str.startswith(('ECO_', 'TREAT_PUB_')))
                 ]
                 
                 if not direct_citations.empty:
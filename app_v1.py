@@ -9,6 +9,8 @@ import sqlite3
 import plotly.graph_objects as go
 import numpy as np
 import os
+from config import NODES_QUERY
+from network_store import edges_query
 
 # Page configuration
 st.set_page_config(
@@ -162,8 +164,8 @@ def load_database():
     try:
         if os.path.exists('streamlit_research_database.db'):
             conn = sqlite3.connect('streamlit_research_database.db')
-            nodes_df = pd.read_sql('SELECT * FROM nodes', conn)
-            edges_df = pd.read_sql('SELECT * FROM edges', conn)
+            nodes_df = pd.read_sql(NODES_QUERY, conn)
+            edges_df = pd.read_sql(edges_query(conn), conn)
             summary_df = pd.read_sql('SELECT * FROM network_summary', conn)
             conn.close()
             return nodes_df, edges_df, summary_df
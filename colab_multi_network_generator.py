@@ -1,6 +1,6 @@
     def create_grant_node(self, network_config: Dict, network_id: int) -> Dict:
         """Create grant node"""
-        grant_year = random.randint(2015, 2019)  # Grants start early
+        grant_year = int(np.random.randint(2015, 2020))  # Grants start early
         
         return {
             "node_id": f"GRANT_{network_id}",
@@ -8,36 +8,51 @@
             "network_id": network_id,
             "grant_id": self.generate_grant_id(),
             "year": grant_year,
-            "funding_amount": random.randint(500000, 5000000),
+            "funding_amount": int(np.random.randint(500000, 5000001)),
             "disease_focus": network_config["disease"],
             "research_focus": network_config["grant_focus"],
             "institution": "Your Research Institution",
-            "pi_name": random.choice(self.authors),
+            "pi_name": self.authors[np.random.randint(len(self.authors))],
             "node_label": f"Grant: {network_config['grant_focus']}"
         }
     
-    def create_publication_node(self, pmid: int, year: int, keywords: List[str], 
-                              phase: str, network_id: int) -> Dict:
-        """Create publication node with realistic data"""
+    def create_publication_nodes(self, years: np.ndarray, keywords: List[str],
+                                 phases: List[str], network_id: int) -> List[Dict]:
+        """Create a batch of publication nodes, drawing their random fields in bulk"""
         
-        # Generate 1-6 authors
-        num_authors = random.randint(1, 6)
-        authors = random.sample(self.authors, num_authors)
+        num_papers = len(years)
+        pmids = np.random.randint(10000000, 100000000, size=num_papers).tolist()
+        journal_idx = np.random.randint(0, len(self.journals), size=num_papers).tolist()
+        citations = np.random.randint(5, 501, size=num_papers).tolist()
+        impact_factors = np.random.uniform(5.0, 45.0, size=num_papers).round(2).tolist()
         
-        return {
-            "node_id": str(pmid),
-            "node_type": "publication",
-            "network_id": network_id,
-            "pmid": pmid,
-            "title": self.generate_title(keywords, phase),
-            "authors": ", ".join(authors),
-            "journal": random.choice(self.journals),
-            "year": year,
-            "citations": random.randint(5, 500),
-            "impact_factor": round(random.uniform(5.0, 45.0), 2),
-            "research_phase": phase,
-            "node_label": f"PMID {pmid}: {self.generate_title(keywords, phase)[:40]}..."
-        }
+        # Generate 1-6 authors per paper: shuffle the author pool once per paper and take the first k
+        author_names = np.asarray(self.authors)
+        num_authors = np.random.randint(1, 7, size=num_papers)
+        author_order = np.argsort(np.random.random((num_papers, len(author_names))), axis=1)
+        author_idx = [order[:k] for order, k in zip(author_order, num_authors)]
+        
+        # One title per paper, shared by the title field and the node label
+        titles = [self.generate_title(keywords, phase) for phase in phases]
+        
+        return [
+            {
+                "node_id": str(pmid),
+                "node_type": "publication",
+                "network_id": network_id,
+                "pmid": pmid,
+                "title": title,
+                "authors": ", ".join(author_names[authors]),
+                "journal": self.journals[journal],
+                "year": int(year),
+                "citations": cites,
+                "impact_factor": impact,
+                "research_phase": phase,
+                "node_label": f"PMID {pmid}: {title[:40]}..."
+            }
+            for pmid, year, phase, title, authors, journal, cites, impact
+            in zip(pmids, years, phases, titles, author_idx, journal_idx, citations, impact_factors)
+        ]
     
     def create_treatment_node(self, network_config: Dict, network_id: int) -> Dict:
         """Create treatment node"""
@@ -65,36 +80,29 @@
         grant_year = grant["year"]
         
         # 2. Create initial research (4 papers funded by grant)
-        initial_papers = []
-        for i in range(4):
-            pmid = self.generate_pmid()
-            year = random.randint(grant_year + 1, grant_year + 3)
-            paper = self.create_publication_node(pmid, year, network_config["keywords"], "basic", network_id)
-            nodes.append(paper)
-            initial_papers.append(paper)
-            
-            # Grant funds paper
-            edges.append({
+        initial_years = np.random.randint(grant_year + 1, grant_year + 4, size=4)
+        initial_papers = self.create_publication_nodes(initial_years, network_config["keywords"], ["basic"] * 4, network_id)
+        nodes.extend(initial_papers)
+        
+        # Grant funds paper
+        edges.extend(
+            {
                 "source_id": grant["node_id"],
                 "target_id": paper["node_id"],
                 "edge_type": "funded_by",
                 "weight": 1.0,
                 "network_id": network_id
-            })
+            }
+            for paper in initial_papers
+        )
         
         # 3. Create research ecosystem (30 papers)
-        research_papers = []
-        for i in range(30):
-            pmid = self.generate_pmid()
-            year = random.randint(grant_year + 2, network_config["approval_year"] - 2)
-            phase = random.choices(["basic", "translational"], weights=[0.7, 0.3])[0]
-            paper = self.create_publication_node(pmid, year, network_config["keywords"], phase, network_id)
-            nodes.append(paper)
-            research_papers.append(paper)
+        research_years = np.random.randint(grant_year + 2, network_config["approval_year"] - 1, size=30)
+        research_phases = np.random.choice(["basic", "translational"], size=30, p=[0.7, 0.3]).tolist()
+        research_papers = self.create_publication_nodes(research_years, network_config["keywords"], research_phases, network_id)
+        nodes.extend(research_papers)
         
         # 4. Create treatment pathway (3 papers)
-        treatment_papers = []
-        for i in range(3):
-            pmid = self.generate_pmid()
-            year = random.randint(network_config["approval_year"] - 3, network_config["approval_year"] - 1)
-            paper = self.create_publication_node(pmid, year, network_config["keywords"], "treatment", network_id)
+        treatment_years = np.random.randint(network_config["approval_year"] - 3, network_config["approval_year"], size=3)
+        treatment_papers = self.create_publication_nodes(treatment_years, network_config["keywords"], ["treatment"] * 3, network_id)
+        nodes.extend(treatment_papers)
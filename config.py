@@ -5,7 +5,29 @@ DATABASE_PATH = 'streamlit_research_database.db'
 NODES_CSV_PATH = 'streamlit_nodes.csv'
 EDGES_CSV_PATH = 'streamlit_edges.csv'
 SUMMARY_CSV_PATH = 'streamlit_summary.csv'
+NODES_PARQUET_PATH = 'streamlit_nodes.parquet'
+EDGES_PARQUET_PATH = 'streamlit_edges.parquet'
+SUMMARY_PARQUET_PATH = 'streamlit_summary.parquet'
+# Edges are stored with integer edge_type codes; this joins the type names back in
+EDGES_QUERY = ('SELECT edges.source_id, edges.target_id, edge_types.edge_type, edges.network_id '
+               'FROM edges JOIN edge_types USING (edge_type_id) ORDER BY edges.rowid')
+# The nodes table is WITHOUT ROWID (stored by node_id); this reads it back in the generator's order:
+# per network the grant, grant-funded papers, ecosystem papers, treatment papers, then the treatment
+NODES_QUERY = ("SELECT * FROM nodes ORDER BY network_id, "
+               "CASE WHEN node_id LIKE 'GRANT%' THEN 0 WHEN node_id LIKE 'PUB%' THEN 1 WHEN node_id LIKE 'ECO%' THEN 2 "
+               "WHEN node_id LIKE 'TREAT_PUB%' THEN 3 ELSE 4 END, length(node_id), node_id")
+# Databases written before the edge_types table store the type names in the edges table itself
+LEGACY_EDGES_QUERY = 'SELECT source_id, target_id, edge_type, network_id FROM edges ORDER BY rowid'
+# Node columns the dashboard reads; Parquet loads skip the rest
+NODE_COLUMNS = [
+    'node_id', 'node_type', 'network_id', 'grant_id', 'funding_amount', 'year', 'pi_name',
+    'title', 'disease', 'treatment_name', 'approval_year', 'pmid', 'authors', 'journal',
+    'node_x', 'node_y'
+]
 CACHE_TTL = 3600  # Cache data for 1 hour
+# Used to generate the database in-app when no data files are present; bump the version to invalidate the disk cache
+GENERATOR_SEED = 42
+GENERATOR_VERSION = '3.0_enhanced_realistic'
 
 # --- Node and Edge Types ---
 NODE_TYPE_GRANT = 'grant'
@@ -53,6 +75,8 @@ EDGE_WIDTHS = {
 }
 
 # --- Layout Positions (Distances) ---
+# The database generator stores node positions computed from these values;
+# regenerate the database after changing them
 # Refined distances: bring treatment closer to pathway papers
 NODE_POSITIONS_X = {
     'grant': -4,                # Was -5 → moved slightly right
@@ -3,20 +3,75 @@ Enhanced Multi-Network Database Generator
 Realistic citation chains with temporal layers and selective bridging
 """
 
-import json
-import random
-import sqlite3
+import argparse
+import os
+import orjson
+from collections import Counter
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
+from layout import add_layout_columns
+from network_store import (
+    CATEGORY_FIELDS, append_edge, generate_network, network_frames, new_edge_columns, write_database
+)
+
+# Formats save_for_streamlit can write, and the ones it writes by default (the dashboard reads Parquet, then SQLite)
+OUTPUT_FORMATS = ('sqlite', 'parquet', 'csv', 'json')
+DEFAULT_FORMATS = ('sqlite', 'parquet')
+
+# Files each format writes, and the formats the dashboard reads, in the order it tries them
+OUTPUT_FILES = {
+    'sqlite': ('streamlit_research_database.db',),
+    'parquet': ('streamlit_nodes.parquet', 'streamlit_edges.parquet', 'streamlit_summary.parquet'),
+    'csv': ('streamlit_nodes.csv', 'streamlit_edges.csv', 'streamlit_summary.csv'),
+    'json': ('streamlit_database.json',)
+}
+DASHBOARD_READ_ORDER = ('parquet', 'sqlite', 'csv')
+
+# Paper title templates per research phase; {0}-{2} are the network keywords, {title} the first one title-cased
+TITLE_TEMPLATES = {
+    "basic": [
+        "{title} research: Novel therapeutic targets and mechanisms",
+        "Molecular mechanisms of {1} in {0} pathogenesis",
+        "Identification of {2} pathways in {0} development"
+    ],
+    "translational": [
+        "Translational {0} research: From bench to bedside",
+        "Clinical implications of {1} in {0} treatment",
+        "Biomarker discovery for {0} using {2} approaches"
+    ],
+    "treatment": [
+        "Clinical trial results for {0} treatment using {1}",
+        "Phase II study of {2} in {0} patients",
+        "Efficacy and safety of novel {1} therapy for {0}"
+    ]
+}
+
+def write_csv(df: pd.DataFrame, path: str):
+    """Write a CSV backup with PyArrow's multi-threaded C++ writer"""
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+def write_columns(f, df: pd.DataFrame):
+    """Write a DataFrame as a column-oriented JSON object ({column: [values]}), one column at a time"""
+    f.write(b'{')
+    for i, column in enumerate(df.columns):
+        if i:
+            f.write(b',')
+        f.write(b'\n' + orjson.dumps(column) + b':')
+        f.write(orjson.dumps(df[column].to_numpy().tolist()))
+    f.write(b'}')
 
 class EnhancedStreamlitDatabaseGenerator:
     def __init__(self, seed: Optional[int] = None):
         """Initialize the enhanced database generator"""
-        if seed:
-            random.seed(seed)
-            np.random.seed(seed)
+        # One seeded generator drives every random draw; each network gets a child seed spawned from it
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
         
         # 3 Disease/Treatment networks with different chain requirements
         self.networks = [
@@ -57,6 +112,10 @@ class EnhancedStreamlitDatabaseGenerator:
             "Dr. Jessica Davis", "Dr. Matthew Miller", "Dr. Rachel White", "Dr. Andrew Jackson",
             "Dr. Stephanie Thomas", "Dr. Kevin Martinez", "Dr. Nicole Johnson", "Dr. Brandon Lee"
         ]
+        self.authors_arr = np.array(self.authors)
+        
+        # Formatted paper titles per (phase, keywords), filled by generate_title
+        self.title_cache = {}
         
         self.journals = [
             "Nature", "Science", "Cell", "Nature Medicine", "Science Translational Medicine",
@@ -66,46 +125,38 @@ class EnhancedStreamlitDatabaseGenerator:
     
     def generate_pmid(self) -> int:
         """Generate realistic PMID"""
-        return random.randint(10000000, 99999999)
+        return int(self.rng.integers(10000000, 100000000))
     
     def generate_grant_id(self) -> str:
         """Generate realistic grant ID"""
         prefixes = ["INST-R01", "INST-U01", "INST-R21", "INST-P01"]
-        return f"{random.choice(prefixes)}-{random.randint(100000, 999999)}"
+        return f"{prefixes[self.rng.integers(len(prefixes))]}-{self.rng.integers(100000, 1000000)}"
     
     def generate_title(self, keywords: List[str], phase: str) -> str:
         """Generate realistic paper title"""
-        templates = {
-            "basic": [
-                f"{keywords[0].title()} research: Novel therapeutic targets and mechanisms",
-                f"Molecular mechanisms of {keywords[1]} in {keywords[0]} pathogenesis",
-                f"Identification of {keywords[2]} pathways in {keywords[0]} development"
-            ],
-            "translational": [
-                f"Translational {keywords[0]} research: From bench to bedside",
-                f"Clinical implications of {keywords[1]} in {keywords[0]} treatment",
-                f"Biomarker discovery for {keywords[0]} using {keywords[2]} approaches"
-            ],
-            "treatment": [
-                f"Clinical trial results for {keywords[0]} treatment using {keywords[1]}",
-                f"Phase II study of {keywords[2]} in {keywords[0]} patients",
-                f"Efficacy and safety of novel {keywords[1]} therapy for {keywords[0]}"
-            ]
-        }
-        return random.choice(templates.get(phase, templates["basic"]))
+        if phase not in TITLE_TEMPLATES:
+            phase = "basic"
+        
+        # Each network has fixed keywords, so the formatted titles are built once per (phase, keywords)
+        key = (phase, tuple(keywords))
+        titles = self.title_cache.get(key)
+        if titles is None:
+            titles = [template.format(*keywords, title=keywords[0].title()) for template in TITLE_TEMPLATES[phase]]
+            self.title_cache[key] = titles
+        return titles[self.rng.integers(len(titles))]
     
     def create_grant_node(self, network_config: Dict, network_id: int) -> Dict:
         """Create grant node"""
-        grant_year = random.randint(2015, 2019)
+        grant_year = int(self.rng.integers(2015, 2020))
         
         return {
             "node_id": f"GRANT_{network_id}",
             "node_type": "grant",
             "network_id": network_id,
             "grant_id": self.generate_grant_id(),
-            "funding_amount": random.randint(1500000, 3000000),
+            "funding_amount": int(self.rng.integers(1500000, 3000001)),
             "year": grant_year,
-            "pi_name": random.choice(self.authors),
+            "pi_name": self.authors[self.rng.integers(len(self.authors))],
             "title": f"{network_config['grant_focus']} Initiative",
             "disease": network_config["disease"],
             "treatment_name": network_config["treatment_name"],
@@ -119,8 +170,8 @@ class EnhancedStreamlitDatabaseGenerator:
         """Create publication node with enhanced metadata"""
         
         pmid = self.generate_pmid()
-        num_authors = random.randint(2, 8)
-        authors = random.sample(self.authors, num_authors)
+        num_authors = int(self.rng.integers(2, 9))
+        author_idx = self.rng.choice(len(self.authors_arr), size=num_authors, replace=False)
         
         return {
             "node_id": node_id,
@@ -129,8 +180,8 @@ class EnhancedStreamlitDatabaseGenerator:
             "pmid": pmid,
             "year": year,
             "title": self.generate_title(keywords, phase),
-            "authors": ", ".join(authors),
-            "journal": random.choice(self.journals),
+            "authors": ", ".join(self.authors_arr[author_idx]),
+            "journal": self.journals[self.rng.integers(len(self.journals))],
             "funded_by_grant": 1 if funded_by_grant else 0,
             "treatment_related": 1 if treatment_related else 0,
             "citation_count": 0  # Will be calculated later
@@ -148,39 +199,37 @@ class EnhancedStreamlitDatabaseGenerator:
             "fda_approved": 1
         }
     
-    def create_temporal_layers(self, papers: List[Dict]) -> Dict[int, List[Dict]]:
-        """Organize papers into temporal layers by year"""
-        layers = {}
-        for paper in papers:
-            year = paper["year"]
-            if year not in layers:
-                layers[year] = []
-            layers[year].append(paper)
-        return layers
-    
-    def select_bridge_papers(self, ecosystem_papers: List[Dict], num_bridges: int) -> List[Dict]:
+    def select_bridge_papers(self, ecosystem_papers: List[Dict], eco_years: np.ndarray, num_bridges: int) -> List[Dict]:
         """Select the most cited ecosystem papers to serve as bridges"""
-        # Sort by year (older papers tend to be more cited)
-        sorted_papers = sorted(ecosystem_papers, key=lambda x: x["year"])
+        # Order by year (older papers tend to be more cited)
+        year_order = np.argsort(eco_years, kind='stable')
         
         # Select papers from earlier years as potential bridges
-        early_papers = sorted_papers[:len(sorted_papers)//2]
+        early_papers = [ecosystem_papers[i] for i in year_order[:len(year_order)//2]]
         
         # Select bridge papers
         num_bridges = min(num_bridges, len(early_papers))
-        bridge_papers = random.sample(early_papers, num_bridges)
+        bridge_papers = [early_papers[i] for i in self.rng.choice(len(early_papers), size=num_bridges, replace=False)]
         
         # Mark them as highly cited
         for paper in bridge_papers:
-            paper["citation_count"] = random.randint(50, 150)
+            paper["citation_count"] = int(self.rng.integers(50, 151))
         
         return bridge_papers
     
-    def generate_realistic_citations(self, nodes: List[Dict], network_config: Dict, network_id: int) -> List[Dict]:
+    def generate_realistic_citations(self, nodes: List[Dict], network_config: Dict, network_id: int) -> Dict[str, list]:
         """
         Generate realistic citation patterns with temporal layers and selective bridging
         """
-        edges = []
+        edges = new_edge_columns()
+        seen_edges = set()
+        
+        def add_edge(source_id: str, target_id: str, edge_type: str):
+            """Append an edge unless the same source → target pair already exists"""
+            if (source_id, target_id) in seen_edges:
+                return
+            seen_edges.add((source_id, target_id))
+            append_edge(edges, source_id, target_id, edge_type)
         
         # Separate node types
         grant_papers = [n for n in nodes if n["node_id"].startswith("PUB_")]
@@ -193,146 +242,106 @@ class EnhancedStreamlitDatabaseGenerator:
         print(f"     Treatment papers: {len(treatment_papers)}")
         print(f"     Ecosystem papers: {len(ecosystem_papers)}")
         
-        # Create temporal layers
-        ecosystem_layers = self.create_temporal_layers(ecosystem_papers)
+        # Ecosystem years, shared by bridge selection and the vectorized citation steps
+        eco_years = np.array([p["year"] for p in ecosystem_papers], dtype=np.int64)
         
         # Select bridge papers (most cited ecosystem papers)
         num_guaranteed_chains = network_config["guaranteed_chains"]
-        bridge_papers = self.select_bridge_papers(ecosystem_papers, num_guaranteed_chains * 2)
+        bridge_papers = self.select_bridge_papers(ecosystem_papers, eco_years, num_guaranteed_chains * 2)
         
         print(f"     Bridge papers selected: {len(bridge_papers)}")
         print(f"     Guaranteed chains required: {num_guaranteed_chains}")
         
         # 1. GUARANTEED CHAINS: Treatment → Bridge Ecosystem → Selected Grant Papers
-        selected_grant_papers = random.sample(grant_papers, min(num_guaranteed_chains, len(grant_papers)))
+        num_selected = min(num_guaranteed_chains, len(grant_papers))
+        selected_grant_papers = [grant_papers[i] for i in self.rng.choice(len(grant_papers), size=num_selected, replace=False)]
         
         for i, treatment_paper in enumerate(treatment_papers):
             if i < num_guaranteed_chains:
                 # Select a bridge paper for this chain
-                bridge_paper = random.choice(bridge_papers)
+                bridge_paper = bridge_papers[self.rng.integers(len(bridge_papers))]
                 target_grant = selected_grant_papers[i % len(selected_grant_papers)]
                 
                 # Treatment → Bridge Ecosystem
-                edges.append({
-                    "source_id": treatment_paper["node_id"],
-                    "target_id": bridge_paper["node_id"],
-                    "edge_type": "leads_to_treatment",
-                    "network_id": network_id
-                })
+                add_edge(treatment_paper["node_id"], bridge_paper["node_id"], "leads_to_treatment")
                 
                 # Bridge Ecosystem → Grant (via regular citation)
-                edges.append({
-                    "source_id": bridge_paper["node_id"],
-                    "target_id": target_grant["node_id"],
-                    "edge_type": "cites",
-                    "network_id": network_id
-                })
+                add_edge(bridge_paper["node_id"], target_grant["node_id"], "cites")
                 
                 print(f"     Chain {i+1}: {treatment_paper['node_id']} → {bridge_paper['node_id']} → {target_grant['node_id']}")
         
         # 2. TEMPORAL LAYER CITATIONS: Newer ecosystem papers cite older ones
-        sorted_years = sorted(ecosystem_layers.keys())
-        for i, year in enumerate(sorted_years[1:], 1):  # Start from second year
-            current_papers = ecosystem_layers[year]
-            
-            # Cite papers from previous years
-            for prev_year in sorted_years[:i]:
-                prev_papers = ecosystem_layers[prev_year]
-                
-                for current_paper in current_papers:
-                    # Higher probability to cite recent papers, lower for older
-                    year_diff = year - prev_year
-                    if year_diff <= 2:
-                        cite_prob = 0.4
-                    elif year_diff <= 4:
-                        cite_prob = 0.2
-                    else:
-                        cite_prob = 0.1
-                    
-                    # Select papers to cite
-                    num_citations = random.randint(0, 3)
-                    if num_citations > 0 and random.random() < cite_prob:
-                        cited_papers = random.sample(prev_papers, min(num_citations, len(prev_papers)))
-                        for cited_paper in cited_papers:
-                            edges.append({
-                                "source_id": current_paper["node_id"],
-                                "target_id": cited_paper["node_id"],
-                                "edge_type": "cites",
-                                "network_id": network_id
-                            })
+        # Every (paper, earlier year) pair is one trial, drawn for all pairs at once
+        layer_years, layer_sizes = np.unique(eco_years, return_counts=True)
+        year_diff = eco_years[:, None] - layer_years[None, :]
+        
+        # Higher probability to cite recent papers, lower for older
+        cite_prob = np.select([year_diff <= 0, year_diff <= 2, year_diff <= 4], [0.0, 0.4, 0.2], default=0.1)
+        num_citations = self.rng.integers(0, 4, size=year_diff.shape)
+        cites = (num_citations > 0) & (self.rng.random(year_diff.shape) < cite_prob)
+        citing_idx, layer_idx = np.nonzero(cites)
+        
+        # Cite up to num_citations distinct papers of each chosen year: rank that year's papers randomly, keep the top ones
+        num_cited = np.minimum(num_citations[citing_idx, layer_idx], layer_sizes[layer_idx])
+        rank_keys = self.rng.random((len(citing_idx), len(ecosystem_papers)))
+        rank_keys[eco_years[None, :] != layer_years[layer_idx][:, None]] = np.inf
+        ranks = rank_keys.argsort(axis=1).argsort(axis=1)
+        pair_idx, cited_idx = np.nonzero(ranks < num_cited[:, None])
+        
+        for source_idx, target_idx in zip(citing_idx[pair_idx], cited_idx):
+            add_edge(ecosystem_papers[source_idx]["node_id"], ecosystem_papers[target_idx]["node_id"], "cites")
         
         # 3. TREATMENT PAPERS → ECOSYSTEM PAPERS (High probability, avoid direct grant citations)
         for treatment_paper in treatment_papers:
             # High probability to cite ecosystem papers
-            num_eco_citations = random.randint(3, 8)
+            num_eco_citations = int(self.rng.integers(3, 9))
             potential_targets = [p for p in ecosystem_papers if p["year"] < treatment_paper["year"]]
             
             if potential_targets:
                 # Prefer bridge papers and recent ecosystem papers
                 weighted_targets = bridge_papers + potential_targets[-10:]  # Recent papers
-                # Remove duplicates by node_id
-                seen_ids = set()
-                unique_targets = []
-                for target in weighted_targets:
-                    if target["node_id"] not in seen_ids:
-                        unique_targets.append(target)
-                        seen_ids.add(target["node_id"])
+                # Remove duplicates by node_id (dicts keep first-insertion order)
+                unique_targets = list({p["node_id"]: p for p in weighted_targets}.values())
                 
-                selected_targets = random.sample(
-                    unique_targets, 
-                    min(num_eco_citations, len(unique_targets))
+                selected_idx = self.rng.choice(
+                    len(unique_targets), 
+                    size=min(num_eco_citations, len(unique_targets)), replace=False
                 )
+                selected_targets = [unique_targets[i] for i in selected_idx]
                 
                 for target in selected_targets:
-                    # Avoid duplicate edges
-                    existing_edge = any(
-                        e["source_id"] == treatment_paper["node_id"] and 
-                        e["target_id"] == target["node_id"]
-                        for e in edges
-                    )
-                    if not existing_edge:
-                        edges.append({
-                            "source_id": treatment_paper["node_id"],
-                            "target_id": target["node_id"],
-                            "edge_type": "leads_to_treatment",
-                            "network_id": network_id
-                        })
+                    # add_edge skips targets this paper already cites (e.g. its guaranteed bridge)
+                    add_edge(treatment_paper["node_id"], target["node_id"], "leads_to_treatment")
         
         # 4. NO DIRECT CITATIONS: Treatment papers never cite grant papers directly
         # This creates more realistic citation patterns where treatment papers
         # only cite through the research ecosystem (ecosystem papers cite grants)
         
         # 4. ECOSYSTEM → GRANT CITATIONS (Medium probability for non-bridge papers)
-        for eco_paper in ecosystem_papers:
-            if eco_paper not in bridge_papers:  # Non-bridge papers
-                for grant_paper in grant_papers:
-                    if (eco_paper["year"] > grant_paper["year"] and 
-                        random.random() < 0.15):  # 15% probability
-                        
-                        edges.append({
-                            "source_id": eco_paper["node_id"],
-                            "target_id": grant_paper["node_id"],
-                            "edge_type": "cites",
-                            "network_id": network_id
-                        })
+        # One 15% draw per (ecosystem paper, grant paper) pair, kept where the ecosystem paper is a later non-bridge paper
+        bridge_ids = {p["node_id"] for p in bridge_papers}
+        non_bridge = np.array([p["node_id"] not in bridge_ids for p in ecosystem_papers], dtype=bool)
+        grant_years = np.array([p["year"] for p in grant_papers])
+        eligible = non_bridge[:, None] & (eco_years[:, None] > grant_years[None, :])
+        cites = eligible & (self.rng.random(eligible.shape) < 0.15)
+        
+        for eco_idx, grant_idx in zip(*np.nonzero(cites)):
+            add_edge(ecosystem_papers[eco_idx]["node_id"], grant_papers[grant_idx]["node_id"], "cites")
         
         # Count edge types for reporting
-        citation_counts = {}
-        for edge in edges:
-            edge_type = edge["edge_type"]
-            citation_counts[edge_type] = citation_counts.get(edge_type, 0) + 1
+        citation_counts = dict(Counter(edges["edge_type"]))
         
         print(f"     Generated citations: {citation_counts}")
         
         return edges
     
-    def generate_single_network(self, network_config: Dict, network_id: int) -> Tuple[List[Dict], List[Dict]]:
+    def generate_single_network(self, network_config: Dict, network_id: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Generate one complete citation network with enhanced realistic patterns"""
         
         print(f"🔬 Generating Enhanced Network {network_id}: {network_config['disease']}")
         
         nodes = []
-        edges = []
+        edges = new_edge_columns()
         
         # 1. Create grant
         grant = self.create_grant_node(network_config, network_id)
@@ -343,7 +352,7 @@ class EnhancedStreamlitDatabaseGenerator:
         grant_papers = []
         for i in range(1, 5):
             node_id = f"PUB_{network_id}_{i}"
-            year = random.randint(grant_year + 1, grant_year + 3)
+            year = int(self.rng.integers(grant_year + 1, grant_year + 4))
             paper = self.create_publication_node(
                 node_id, year, network_config["keywords"], "basic", 
                 network_id, funded_by_grant=True
@@ -352,26 +361,21 @@ class EnhancedStreamlitDatabaseGenerator:
             grant_papers.append(paper)
             
             # GUARANTEED: Grant funds paper
-            edges.append({
-                "source_id": grant["node_id"],
-                "target_id": paper["node_id"],
-                "edge_type": "funded_by",
-                "network_id": network_id
-            })
+            append_edge(edges, grant["node_id"], paper["node_id"], "funded_by")
         
         # 3. Create ecosystem publications (25 papers) with temporal distribution
+        # Distribute across years with more recent papers; weights are normalized once and all draws batched
+        year_range = network_config["approval_year"] - grant_year - 2
+        year_weights = np.array([1, 2, 3, 4, 4, 3, 2, 1][:year_range], dtype=np.float64)  # Peak in middle years
+        year_offsets = self.rng.choice(np.arange(2, year_range + 2), size=25, p=year_weights / year_weights.sum())
+        phases = self.rng.choice(["basic", "translational"], size=25, p=[0.7, 0.3])
+        
         ecosystem_papers = []
         for i in range(1, 26):
             node_id = f"ECO_{network_id}_{i}"
-            # Distribute across years with more recent papers
-            year_range = network_config["approval_year"] - grant_year - 2
-            year_weights = [1, 2, 3, 4, 4, 3, 2, 1][:year_range]  # Peak in middle years
-            year_offset = random.choices(range(2, year_range + 2), weights=year_weights[:year_range])[0]
-            year = grant_year + year_offset
-            
-            phase = random.choices(["basic", "translational"], weights=[0.7, 0.3])[0]
+            year = grant_year + int(year_offsets[i - 1])
             paper = self.create_publication_node(
-                node_id, year, network_config["keywords"], phase, network_id
+                node_id, year, network_config["keywords"], str(phases[i - 1]), network_id
             )
             nodes.append(paper)
             ecosystem_papers.append(paper)
@@ -380,7 +384,7 @@ class EnhancedStreamlitDatabaseGenerator:
         treatment_papers = []
         for i in range(1, 4):
             node_id = f"TREAT_PUB_{network_id}_{i}"
-            year = random.randint(network_config["approval_year"] - 3, network_config["approval_year"] - 1)
+            year = int(self.rng.integers(network_config["approval_year"] - 3, network_config["approval_year"]))
             paper = self.create_publication_node(
                 node_id, year, network_config["keywords"], "treatment", 
                 network_id, treatment_related=True
@@ -394,47 +398,52 @@ class EnhancedStreamlitDatabaseGenerator:
         
         # GUARANTEED: Treatment papers enable final treatment
         for treatment_paper in treatment_papers:
-            edges.append({
-                "source_id": treatment_paper["node_id"],
-                "target_id": treatment["node_id"],
-                "edge_type": "enables_treatment",
-                "network_id": network_id
-            })
+            append_edge(edges, treatment_paper["node_id"], treatment["node_id"], "enables_treatment")
         
         # 6. Generate enhanced realistic citations
         citation_edges = self.generate_realistic_citations(nodes, network_config, network_id)
-        edges.extend(citation_edges)
+        for column, values in citation_edges.items():
+            edges[column].extend(values)
         
-        print(f"   ✅ {len(nodes)} nodes, {len(edges)} edges generated")
+        print(f"   ✅ {len(nodes)} nodes, {len(edges['source_id'])} edges generated")
         
-        return nodes, edges
+        return network_frames(nodes, edges, network_id)
     
-    def generate_complete_database(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Generate all 3 networks with enhanced realistic citation patterns"""
+    def generate_complete_database(self, max_workers: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Generate all 3 networks with enhanced realistic citation patterns (in worker processes if max_workers > 1)"""
         
-        all_nodes = []
-        all_edges = []
+        node_frames = []
+        edge_frames = []
         
         print("🏥 Generating ENHANCED Research Impact Database")
         print("=" * 65)
         print("Realistic citation chains with temporal layers and selective bridging\\n")
         
-        for i, network_config in enumerate(self.networks, 1):
-            nodes, edges = self.generate_single_network(network_config, i)
-            all_nodes.extend(nodes)
-            all_edges.extend(edges)
+        # Networks are independent and each draws from its own child seed, so the result does not depend on max_workers
+        network_args = (repeat(self), self.seed_sequence.spawn(len(self.networks)),
+                        self.networks, range(1, len(self.networks) + 1))
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(generate_network, *network_args))
+        else:
+            results = list(map(generate_network, *network_args))
+        
+        for network_nodes, network_edges in results:
+            node_frames.append(network_nodes)
+            edge_frames.append(network_edges)
             print()
         
-        nodes_df = pd.DataFrame(all_nodes)
-        edges_df = pd.DataFrame(all_edges)
+        # Categories are applied after concatenating: concat of categoricals with different categories falls back to object
+        nodes_df = pd.concat(node_frames, ignore_index=True).astype({field: 'category' for field in CATEGORY_FIELDS})
+        edges_df = pd.concat(edge_frames, ignore_index=True).astype({'edge_type': 'category'})
+        
+        # Generate summary statistics from one grouping pass instead of masking the frames per network
+        grant_rows = nodes_df[nodes_df['node_type'] == 'grant'].drop_duplicates('network_id').set_index('network_id')
+        pub_counts = nodes_df[nodes_df['node_type'] == 'publication'].groupby('network_id').size()
         
-        # Generate summary statistics
         summary_data = []
         for i, network_config in enumerate(self.networks, 1):
-            network_nodes = nodes_df[nodes_df['network_id'] == i]
-            network_edges = edges_df[edges_df['network_id'] == i]
-            
-            grant_node = network_nodes[network_nodes['node_type'] == 'grant'].iloc[0]
+            grant_node = grant_rows.loc[i]
             
             summary_data.append({
                 'network_id': i,
@@ -444,21 +453,24 @@ class EnhancedStreamlitDatabaseGenerator:
                 'grant_year': int(grant_node['year']),
                 'approval_year': network_config['approval_year'],
                 'funding_amount': int(grant_node['funding_amount']),
-                'total_publications': len(network_nodes[network_nodes['node_type'] == 'publication']),
+                'total_publications': int(pub_counts.get(i, 0)),
                 'research_duration': network_config['approval_year'] - int(grant_node['year']),
                 'guaranteed_chains': network_config['guaranteed_chains']
             })
         
         summary_df = pd.DataFrame(summary_data)
         
+        # Edge counts per (network, type) in one pass; the breakdown and chain report below only format them
+        edge_type_counts = edges_df.groupby(['network_id', 'edge_type'], observed=False).size().unstack(fill_value=0)
+        
         print(f"📊 ENHANCED Database Summary:")
         print(f"   🎯 Total Networks: {len(self.networks)}")
         print(f"   📄 Total Nodes: {len(nodes_df)}")
         print(f"   🔗 Total Edges: {len(edges_df)}")
-        print(f"   💰 Total Funding: ${nodes_df[nodes_df['node_type']=='grant']['funding_amount'].sum():,.0f}")
+        print(f"   💰 Total Funding: ${grant_rows['funding_amount'].sum():,.0f}")
         
         # Edge type breakdown
-        edge_counts = edges_df['edge_type'].value_counts()
+        edge_counts = edge_type_counts.sum(axis=0).sort_values(ascending=False, kind='stable')
         print(f"\\n🔗 Edge Type Breakdown:")
         for edge_type, count in edge_counts.items():
             print(f"   {edge_type}: {count}")
@@ -466,60 +478,119 @@ class EnhancedStreamlitDatabaseGenerator:
         # Chain analysis
         print(f"\\n🔗 Guaranteed Chain Distribution:")
         for i, network_config in enumerate(self.networks, 1):
-            network_edges = edges_df[edges_df['network_id'] == i]
-            treatment_edges = len(network_edges[network_edges['edge_type'] == 'leads_to_treatment'])
+            treatment_edges = edge_type_counts.at[i, 'leads_to_treatment'] if i in edge_type_counts.index else 0
             print(f"   Network {i} ({network_config['disease']}): {treatment_edges} treatment connections")
         
         return nodes_df, edges_df, summary_df
     
-    def save_for_streamlit(self, nodes_df: pd.DataFrame, edges_df: pd.DataFrame, summary_df: pd.DataFrame):
-        """Save enhanced database in multiple formats"""
+    def remove_stale_outputs(self, formats: Tuple[str, ...]):
+        """Delete earlier outputs the dashboard would read instead of this save's, and warn about other leftovers"""
+        read_formats = [fmt for fmt in DASHBOARD_READ_ORDER if fmt in formats]
+        shadowing = DASHBOARD_READ_ORDER[:DASHBOARD_READ_ORDER.index(read_formats[0])] if read_formats else DASHBOARD_READ_ORDER
+        
+        for fmt in OUTPUT_FORMATS:
+            if fmt in formats:
+                continue
+            for path in OUTPUT_FILES[fmt]:
+                if not os.path.exists(path):
+                    continue
+                if fmt in shadowing:
+                    os.remove(path)
+                    print(f"   🗑️ Removed stale {path} (the dashboard would read it before the new files)")
+                else:
+                    print(f"   ⚠️ {path} is from an earlier save and was not updated")
+    
+    def save_for_streamlit(self, nodes_df: pd.DataFrame, edges_df: pd.DataFrame, summary_df: pd.DataFrame,
+                           formats: Tuple[str, ...] = DEFAULT_FORMATS):
+        """Save enhanced database in the requested formats (any of OUTPUT_FORMATS)"""
+        
+        unknown = set(formats) - set(OUTPUT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown output formats: {', '.join(sorted(unknown))}")
         
         print("\\n💾 Saving Enhanced Database...")
         
-        # 1. SQLite database (primary format)
-        conn = sqlite3.connect("streamlit_research_database.db")
-        nodes_df.to_sql('nodes', conn, if_exists='replace', index=False)
-        edges_df.to_sql('edges', conn, if_exists='replace', index=False)
-        summary_df.to_sql('network_summary', conn, if_exists='replace', index=False)
-        conn.close()
-        
-        # 2. CSV files (backup format)
-        nodes_df.to_csv('streamlit_nodes.csv', index=False)
-        edges_df.to_csv('streamlit_edges.csv', index=False)
-        summary_df.to_csv('streamlit_summary.csv', index=False)
-        
-        # 3. JSON backup
-        database_json = {
-            'nodes': nodes_df.to_dict('records'),
-            'edges': edges_df.to_dict('records'),
-            'summary': summary_df.to_dict('records'),
-            'metadata': {
-                'generated_at': datetime.now().isoformat(),
-                'version': '3.0_enhanced_realistic',
-                'total_networks': len(self.networks),
-                'total_nodes': len(nodes_df),
-                'total_edges': len(edges_df),
-                'features': [
-                    'Temporal citation layers',
-                    'Selective bridge papers',
-                    'Guaranteed citation chains',
-                    'Realistic direct citation probability (5%)',
-                    'Variable chain requirements per network'
+        self.remove_stale_outputs(formats)
+        
+        # Store edges grouped by (network_id, edge_type), the order the dashboard indexes them in
+        edges_df = edges_df.sort_values(['network_id', 'edge_type'], kind='stable', ignore_index=True)
+        
+        # Lay the networks out once here instead of on every dashboard render
+        nodes_df = add_layout_columns(nodes_df)
+        
+        if 'sqlite' in formats:
+            # SQLite database (read when there are no Parquet files)
+            write_database(nodes_df, edges_df, summary_df)
+            print("   ✅ SQLite database: streamlit_research_database.db")
+        
+        # CSV backups and Parquet files (columnar, keeps dtypes), written concurrently since they are independent
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            writes = []
+            if 'csv' in formats:
+                writes += [
+                    pool.submit(write_csv, nodes_df, 'streamlit_nodes.csv'),
+                    pool.submit(write_csv, edges_df, 'streamlit_edges.csv'),
+                    pool.submit(write_csv, summary_df, 'streamlit_summary.csv')
                 ]
-            }
+            if 'parquet' in formats:
+                writes += [
+                    pool.submit(nodes_df.to_parquet, 'streamlit_nodes.parquet', engine='pyarrow', compression='zstd', index=False),
+                    pool.submit(edges_df.to_parquet, 'streamlit_edges.parquet', engine='pyarrow', compression='zstd', index=False),
+                    pool.submit(summary_df.to_parquet, 'streamlit_summary.parquet', engine='pyarrow', compression='zstd', index=False)
+                ]
+            for write in writes:
+                write.result()
+        
+        if 'csv' in formats:
+            print("   ✅ CSV files: streamlit_nodes.csv, streamlit_edges.csv, streamlit_summary.csv")
+        if 'parquet' in formats:
+            print("   ✅ Parquet files: streamlit_nodes.parquet, streamlit_edges.parquet, streamlit_summary.parquet")
+        
+        # Generation metadata, kept in a small file of its own so the full JSON dump is optional
+        metadata = {
+            'generated_at': datetime.now().isoformat(),
+            'version': '3.0_enhanced_realistic',
+            'total_networks': len(self.networks),
+            'total_nodes': len(nodes_df),
+            'total_edges': len(edges_df),
+            'features': [
+                'Temporal citation layers',
+                'Selective bridge papers',
+                'Guaranteed citation chains',
+                'Realistic direct citation probability (5%)',
+                'Variable chain requirements per network'
+            ]
         }
+        with open('streamlit_metadata.json', 'wb') as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        
+        print("   ✅ Metadata: streamlit_metadata.json")
         
-        with open('streamlit_database.json', 'w') as f:
-            json.dump(database_json, f, indent=2)
+        if 'json' not in formats:
+            return
+        
+        # JSON backup, streamed section by section so no second copy of the data is built in memory
+        with open('streamlit_database.json', 'wb') as f:
+            f.write(b'{"metadata":' + orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+            for section, df in (('nodes', nodes_df), ('edges', edges_df), ('summary', summary_df)):
+                f.write(b',\n"' + section.encode() + b'":')
+                write_columns(f, df)
+            f.write(b'}\n')
         
-        print("   ✅ SQLite database: streamlit_research_database.db")
-        print("   ✅ CSV files: streamlit_nodes.csv, streamlit_edges.csv, streamlit_summary.csv")
         print("   ✅ JSON backup: streamlit_database.json")
 
 def main():
     """Generate enhanced database with realistic citation chains"""
     
+    parser = argparse.ArgumentParser(description="Generate the research impact database")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help=f"comma-separated output formats from {', '.join(OUTPUT_FORMATS)} (default: %(default)s)")
+    args = parser.parse_args()
+    formats = tuple(fmt.strip() for fmt in args.formats.split(',') if fmt.strip())
+    unknown = set(formats) - set(OUTPUT_FORMATS)
+    if unknown:
+        parser.error(f"unknown formats: {', '.join(sorted(unknown))}")
+    
     print("🚀 Starting Enhanced Database Generation...")
     print("Features: Temporal layers + Bridge papers + Selective chains\\n")
     
@@ -527,10 +598,10 @@ def main():
     generator = EnhancedStreamlitDatabaseGenerator(seed=42)
     
     # Generate complete database
-    nodes_df, edges_df, summary_df = generator.generate_complete_database()
+    nodes_df, edges_df, summary_df = generator.generate_complete_database(max_workers=len(generator.networks))
     
     # Save in multiple formats
-    generator.save_for_streamlit(nodes_df, edges_df, summary_df)
+    generator.save_for_streamlit(nodes_df, edges_df, summary_df, formats=formats)
     
     print("\\n🎉 Enhanced Database Generation Complete!")
     print("Ready for Streamlit with realistic citation chains and temporal layers.")
@@ -3,20 +3,44 @@ Improved Multi-Network Database Generator
 Enhanced with realistic citation bias patterns and guaranteed connections
 """
 
-import json
-import random
-import sqlite3
+import orjson
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
+from layout import add_layout_columns
+from network_store import (
+    CATEGORY_FIELDS, append_edge, frame_columns, generate_network, network_frames, new_edge_columns, write_database
+)
+
+# Publication categories, set when each paper is created
+GRANT_PAPER, TREATMENT_PAPER, ECOSYSTEM_PAPER = 0, 1, 2
+
+# Citation probability by (years between papers, citing paper category, cited paper category), computed once
+# Year gaps are bucketed by np.digitize(gap, CITATION_GAP_EDGES): <= 0, 1-2, 3-4, 5+
+CITATION_GAP_EDGES = [1, 3, 5]
+TIME_BONUS = np.array([0.0, 0.4, 0.2, 0.05])  # Newer cites older, recent papers most
+PROXIMITY_BONUS = np.array([
+    [0.2, 0.2, 0.2],  # Standard for papers outside the treatment layer
+    [0.1, 0.6, 0.3],  # Treatment papers: low to grant papers, high within their layer, medium to ecosystem
+    [0.2, 0.2, 0.2]
+])
+CITATION_PROB = np.minimum(0.1 + TIME_BONUS[:, None, None] + PROXIMITY_BONUS[None, :, :], 0.9)
+CITATION_PROB[0] = 0.0  # Can't cite future papers
+
+def extend_edges(edges: Dict[str, list], more_edges: Dict[str, list]):
+    """Append every edge of one set of column buffers to another"""
+    for column, values in more_edges.items():
+        edges[column].extend(values)
 
 class ImprovedStreamlitDatabaseGenerator:
     def __init__(self, seed: Optional[int] = None):
         """Initialize the improved database generator"""
-        if seed:
-            random.seed(seed)
-            np.random.seed(seed)
+        # One seeded NumPy generator drives every random draw; each network gets a child seed spawned from it
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
         
         # 3 Disease/Treatment networks for stakeholder demo
         self.networks = [
@@ -60,15 +84,13 @@ class ImprovedStreamlitDatabaseGenerator:
             "New England Journal of Medicine", "The Lancet", "Nature Biotechnology", "PNAS",
             "Cell Metabolism", "Nature Immunology", "Journal of Clinical Investigation"
         ]
-    
-    def generate_pmid(self) -> int:
-        """Generate realistic PMID"""
-        return random.randint(10000000, 99999999)
+        self.authors_arr = np.array(self.authors)
+        self.journals_arr = np.array(self.journals)
     
     def generate_grant_id(self) -> str:
         """Generate realistic grant ID"""
         prefixes = ["INST-R01", "INST-U01", "INST-R21", "INST-P01"]
-        return f"{random.choice(prefixes)}-{random.randint(100000, 999999)}"
+        return f"{prefixes[self.rng.integers(len(prefixes))]}-{self.rng.integers(100000, 1000000)}"
     
     def generate_title(self, keywords: List[str], phase: str) -> str:
         """Generate realistic paper title"""
@@ -89,20 +111,21 @@ class ImprovedStreamlitDatabaseGenerator:
                 f"Efficacy and safety of novel {keywords[1]} therapy for {keywords[0]}"
             ]
         }
-        return random.choice(templates.get(phase, templates["basic"]))
+        titles = templates.get(phase, templates["basic"])
+        return titles[self.rng.integers(len(titles))]
     
     def create_grant_node(self, network_config: Dict, network_id: int) -> Dict:
         """Create grant node"""
-        grant_year = random.randint(2015, 2019)
+        grant_year = int(self.rng.integers(2015, 2020))
         
         return {
             "node_id": f"GRANT_{network_id}",
             "node_type": "grant",
             "network_id": network_id,
             "grant_id": self.generate_grant_id(),
-            "funding_amount": random.randint(1500000, 3000000),
+            "funding_amount": int(self.rng.integers(1500000, 3000001)),
             "year": grant_year,
-            "pi_name": random.choice(self.authors),
+            "pi_name": self.authors[self.rng.integers(len(self.authors))],
             "title": f"{network_config['grant_focus']} Initiative",
             "disease": network_config["disease"],
             "treatment_name": network_config["treatment_name"],
@@ -110,26 +133,36 @@ class ImprovedStreamlitDatabaseGenerator:
             "fda_approved": 1
         }
     
+    def sample_publication_fields(self, count: int) -> List[Dict]:
+        """Draw PMIDs, author lists and journals for a batch of publications in one go"""
+        pmids = self.rng.integers(10000000, 100000000, size=count)
+        num_authors = self.rng.integers(2, 9, size=count)
+        # Rank the author pool randomly per paper; its first num_authors entries are a sample without replacement
+        author_ranks = self.rng.random((count, len(self.authors))).argsort(axis=1)
+        journals = self.journals_arr[self.rng.integers(len(self.journals), size=count)]
+        
+        return [
+            {"pmid": int(pmid), "authors": ", ".join(self.authors_arr[ranks[:k]]), "journal": str(journal)}
+            for pmid, ranks, k, journal in zip(pmids, author_ranks, num_authors, journals)
+        ]
+    
     def create_publication_node(self, node_id: str, year: int, keywords: List[str], 
-                              phase: str, network_id: int, funded_by_grant: bool = False,
-                              treatment_related: bool = False) -> Dict:
-        """Create publication node with enhanced metadata"""
-        
-        pmid = self.generate_pmid()
-        num_authors = random.randint(2, 8)
-        authors = random.sample(self.authors, num_authors)
+                              phase: str, network_id: int, fields: Dict, category: int,
+                              funded_by_grant: bool = False, treatment_related: bool = False) -> Dict:
+        """Create publication node with enhanced metadata from pre-sampled fields"""
         
         return {
             "node_id": node_id,
             "node_type": "publication",
             "network_id": network_id,
-            "pmid": pmid,
+            "pmid": fields["pmid"],
             "year": year,
             "title": self.generate_title(keywords, phase),
-            "authors": ", ".join(authors),
-            "journal": random.choice(self.journals),
+            "authors": fields["authors"],
+            "journal": fields["journal"],
             "funded_by_grant": 1 if funded_by_grant else 0,
-            "treatment_related": 1 if treatment_related else 0
+            "treatment_related": 1 if treatment_related else 0,
+            "category": category  # Used during generation only; not in NODE_FIELDS, so never saved
         }
     
     def create_treatment_node(self, network_config: Dict, network_id: int) -> Dict:
@@ -144,56 +177,33 @@ class ImprovedStreamlitDatabaseGenerator:
             "fda_approved": 1
         }
     
-    def calculate_citation_probability(self, citing_paper: Dict, cited_paper: Dict, 
-                                     grant_papers: List[Dict], treatment_papers: List[Dict]) -> float:
+    def calculate_citation_probability(self, years: np.ndarray, categories: np.ndarray,
+                                     citing_idx: np.ndarray, cited_idx: np.ndarray) -> np.ndarray:
         """
-        Calculate citation probability based on proximity and paper types
+        Calculate citation probabilities for the given (citing, cited) pairs of papers
         Higher probability for papers closer in time and research pathway
         """
+        gap_buckets = np.digitize(years[citing_idx] - years[cited_idx], CITATION_GAP_EDGES)
         
-        # Base probability
-        base_prob = 0.1
-        
-        # Time proximity bonus (newer cites older)
-        if citing_paper["year"] <= cited_paper["year"]:
-            return 0.0  # Can't cite future papers
-        
-        time_diff = citing_paper["year"] - cited_paper["year"]
-        if time_diff <= 2:
-            time_bonus = 0.4
-        elif time_diff <= 4:
-            time_bonus = 0.2
-        else:
-            time_bonus = 0.05
-        
-        # Paper type proximity bonuses
-        citing_is_treatment = citing_paper["node_id"] in [p["node_id"] for p in treatment_papers]
-        cited_is_grant = cited_paper["node_id"] in [p["node_id"] for p in grant_papers]
-        cited_is_treatment = cited_paper["node_id"] in [p["node_id"] for p in treatment_papers]
-        
-        # Treatment papers cite more within their layer
-        if citing_is_treatment and cited_is_treatment:
-            proximity_bonus = 0.6  # High within treatment layer
-        elif citing_is_treatment and not cited_is_grant:
-            proximity_bonus = 0.3  # Medium for ecosystem papers
-        elif citing_is_treatment and cited_is_grant:
-            proximity_bonus = 0.1  # Lower for grant papers (but still possible)
-        else:
-            proximity_bonus = 0.2  # Standard for other combinations
-        
-        return min(base_prob + time_bonus + proximity_bonus, 0.9)
+        # One lookup per pair instead of building bonus matrices and clipping their sum
+        return CITATION_PROB[gap_buckets, categories[citing_idx], categories[cited_idx]]
     
-    def generate_biased_citations(self, nodes: List[Dict], network_id: int) -> List[Dict]:
+    def generate_biased_citations(self, nodes: List[Dict], network_id: int) -> Dict[str, list]:
         """
-        Generate citations with realistic bias patterns
+        Generate citations with realistic bias patterns, as per-column edge buffers
         """
-        edges = []
-        
-        # Separate node types
-        grant_papers = [n for n in nodes if n["node_id"].startswith("PUB_")]
-        treatment_papers = [n for n in nodes if n["node_id"].startswith("TREAT_PUB_")]
-        ecosystem_papers = [n for n in nodes if n["node_id"].startswith("ECO_")]
+        # Citation type per (source_id, target_id): each pair is emitted at most once
+        citations: Dict[Tuple[str, str], str] = {}
+        
+        # Separate publications by category
+        publications = [n for n in nodes if n["node_type"] == "publication"]
+        categories = np.array([p["category"] for p in publications], dtype=np.int8)
+        grant_papers, treatment_papers, ecosystem_papers = (
+            [publications[i] for i in np.flatnonzero(categories == category)]
+            for category in (GRANT_PAPER, TREATMENT_PAPER, ECOSYSTEM_PAPER)
+        )
         all_publications = grant_papers + treatment_papers + ecosystem_papers
+        categories = np.sort(categories, kind="stable")  # Now in all_publications order
         
         print(f"  📊 Citation Generation for Network {network_id}:")
         print(f"     Grant papers: {len(grant_papers)}")
@@ -203,111 +213,97 @@ class ImprovedStreamlitDatabaseGenerator:
         # 1. GUARANTEED: Treatment papers must cite at least 1-3 grant papers
         for treatment_paper in treatment_papers:
             # Guarantee at least 1, at most 3 citations to grant papers
-            num_grant_citations = random.randint(1, min(3, len(grant_papers)))
-            selected_grant_papers = random.sample(grant_papers, num_grant_citations)
+            num_grant_citations = int(self.rng.integers(1, min(3, len(grant_papers)) + 1))
+            selected_grant_papers = [
+                grant_papers[i] for i in self.rng.choice(len(grant_papers), size=num_grant_citations, replace=False)
+            ]
             
             for grant_paper in selected_grant_papers:
                 if treatment_paper["year"] > grant_paper["year"]:
-                    edges.append({
-                        "source_id": treatment_paper["node_id"],
-                        "target_id": grant_paper["node_id"],
-                        "edge_type": "leads_to_treatment",
-                        "network_id": network_id
-                    })
+                    citations[(treatment_paper["node_id"], grant_paper["node_id"])] = "leads_to_treatment"
         
         # 2. Generate all other citations with bias
-        for citing_paper in all_publications:
-            for cited_paper in all_publications:
-                if citing_paper["node_id"] != cited_paper["node_id"]:
-                    prob = self.calculate_citation_probability(
-                        citing_paper, cited_paper, grant_papers, treatment_papers
-                    )
-                    
-                    if random.random() < prob:
-                        # Avoid duplicate leads_to_treatment edges
-                        edge_type = "cites"
-                        if (citing_paper["node_id"].startswith("TREAT_PUB_") and 
-                            cited_paper["node_id"].startswith("PUB_")):
-                            # Check if this edge already exists as leads_to_treatment
-                            existing_edge = any(
-                                e["source_id"] == citing_paper["node_id"] and 
-                                e["target_id"] == cited_paper["node_id"] and 
-                                e["edge_type"] == "leads_to_treatment"
-                                for e in edges
-                            )
-                            if not existing_edge:
-                                edge_type = "leads_to_treatment"
-                        
-                        edges.append({
-                            "source_id": citing_paper["node_id"],
-                            "target_id": cited_paper["node_id"],
-                            "edge_type": edge_type,
-                            "network_id": network_id
-                        })
+        years = np.array([p["year"] for p in all_publications])
+        
+        # Papers can't cite future (or same-year) papers, so only pairs with a newer citing paper get a draw
+        citing_idx, cited_idx = np.nonzero(years[:, None] > years[None, :])
+        prob = self.calculate_citation_probability(years, categories, citing_idx, cited_idx)
+        hits = self.rng.random(prob.size) < prob
+        srcs, tgts = citing_idx[hits], cited_idx[hits]
+        
+        for i, j in zip(srcs, tgts):
+            citing_paper, cited_paper = all_publications[i], all_publications[j]
+            if citing_paper["category"] == TREATMENT_PAPER and cited_paper["category"] == GRANT_PAPER:
+                edge_type = "leads_to_treatment"
+            else:
+                edge_type = "cites"
+            # Pairs already linked in step 1 keep their guaranteed leads_to_treatment edge
+            citations.setdefault((citing_paper["node_id"], cited_paper["node_id"]), edge_type)
+        
+        edges = new_edge_columns()
+        for (source_id, target_id), edge_type in citations.items():
+            append_edge(edges, source_id, target_id, edge_type)
         
         # Count edge types for reporting
         citation_counts = {}
-        for edge in edges:
-            edge_type = edge["edge_type"]
+        for edge_type in edges["edge_type"]:
             citation_counts[edge_type] = citation_counts.get(edge_type, 0) + 1
         
         print(f"     Generated citations: {citation_counts}")
         
         return edges
     
-    def generate_single_network(self, network_config: Dict, network_id: int) -> Tuple[List[Dict], List[Dict]]:
+    def generate_single_network(self, network_config: Dict, network_id: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Generate one complete citation network with improved bias"""
         
         print(f"🔬 Generating Network {network_id}: {network_config['disease']}")
         
         nodes = []
-        edges = []
+        edges = new_edge_columns()
         
         # 1. Create grant
         grant = self.create_grant_node(network_config, network_id)
         nodes.append(grant)
         grant_year = grant["year"]
         
+        # Draw metadata and years for all 32 publications up front
+        pub_fields = iter(self.sample_publication_fields(4 + 25 + 3))
+        grant_pub_years = self.rng.integers(grant_year + 1, grant_year + 4, size=4)
+        eco_years = self.rng.integers(grant_year + 2, network_config["approval_year"] - 1, size=25)
+        eco_phases = self.rng.choice(["basic", "translational"], size=25, p=[0.7, 0.3])
+        treatment_pub_years = self.rng.integers(network_config["approval_year"] - 3, network_config["approval_year"], size=3)
+        
         # 2. Create grant-funded publications (4 papers)
         grant_papers = []
-        for i in range(1, 5):
+        for i, year in enumerate(grant_pub_years, 1):
             node_id = f"PUB_{network_id}_{i}"
-            year = random.randint(grant_year + 1, grant_year + 3)
             paper = self.create_publication_node(
-                node_id, year, network_config["keywords"], "basic", 
-                network_id, funded_by_grant=True
+                node_id, int(year), network_config["keywords"], "basic", 
+                network_id, next(pub_fields), GRANT_PAPER, funded_by_grant=True
             )
             nodes.append(paper)
             grant_papers.append(paper)
             
             # GUARANTEED: Grant funds paper
-            edges.append({
-                "source_id": grant["node_id"],
-                "target_id": paper["node_id"],
-                "edge_type": "funded_by",
-                "network_id": network_id
-            })
+            append_edge(edges, grant["node_id"], paper["node_id"], "funded_by")
         
         # 3. Create ecosystem publications (25 papers)
         ecosystem_papers = []
-        for i in range(1, 26):
+        for i, (year, phase) in enumerate(zip(eco_years, eco_phases), 1):
             node_id = f"ECO_{network_id}_{i}"
-            year = random.randint(grant_year + 2, network_config["approval_year"] - 2)
-            phase = random.choices(["basic", "translational"], weights=[0.7, 0.3])[0]
             paper = self.create_publication_node(
-                node_id, year, network_config["keywords"], phase, network_id
+                node_id, int(year), network_config["keywords"], str(phase), network_id, next(pub_fields), ECOSYSTEM_PAPER
             )
             nodes.append(paper)
             ecosystem_papers.append(paper)
         
         # 4. Create treatment pathway publications (3 papers)
         treatment_papers = []
-        for i in range(1, 4):
+        for i, year in enumerate(treatment_pub_years, 1):
             node_id = f"TREAT_PUB_{network_id}_{i}"
-            year = random.randint(network_config["approval_year"] - 3, network_config["approval_year"] - 1)
             paper = self.create_publication_node(
-                node_id, year, network_config["keywords"], "treatment", 
-                network_id, treatment_related=True
+                node_id, int(year), network_config["keywords"], "treatment", 
+                network_id, next(pub_fields), TREATMENT_PAPER, treatment_related=True
             )
             nodes.append(paper)
             treatment_papers.append(paper)
@@ -318,39 +314,46 @@ class ImprovedStreamlitDatabaseGenerator:
         
         # GUARANTEED: Treatment papers enable final treatment
         for treatment_paper in treatment_papers:
-            edges.append({
-                "source_id": treatment_paper["node_id"],
-                "target_id": treatment["node_id"],
-                "edge_type": "enables_treatment",
-                "network_id": network_id
-            })
+            append_edge(edges, treatment_paper["node_id"], treatment["node_id"], "enables_treatment")
         
         # 6. Generate biased citations
         citation_edges = self.generate_biased_citations(nodes, network_id)
-        edges.extend(citation_edges)
+        extend_edges(edges, citation_edges)
         
-        print(f"   ✅ {len(nodes)} nodes, {len(edges)} edges generated")
+        print(f"   ✅ {len(nodes)} nodes, {len(edges['source_id'])} edges generated")
         
-        return nodes, edges
+        return network_frames(nodes, edges, network_id)
     
-    def generate_complete_database(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Generate all 3 networks with improved citation patterns"""
+    def generate_complete_database(self, max_workers: int = 1) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Generate all 3 networks with improved citation patterns (in worker processes if max_workers > 1)"""
         
-        all_nodes = []
-        all_edges = []
+        node_frames = []
+        edge_frames = []
         
         print("🏥 Generating IMPROVED Research Impact Database")
         print("=" * 60)
         print("Enhanced with realistic citation bias and guaranteed connections\\n")
         
-        for i, network_config in enumerate(self.networks, 1):
-            nodes, edges = self.generate_single_network(network_config, i)
-            all_nodes.extend(nodes)
-            all_edges.extend(edges)
+        # Networks are independent and each draws from its own child seed, so the result does not depend on max_workers
+        network_args = (repeat(self), self.seed_sequence.spawn(len(self.networks)),
+                        self.networks, range(1, len(self.networks) + 1))
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(generate_network, *network_args))
+        else:
+            results = list(map(generate_network, *network_args))
+        
+        for network_nodes, network_edges in results:
+            node_frames.append(network_nodes)
+            edge_frames.append(network_edges)
             print()
         
-        nodes_df = pd.DataFrame(all_nodes)
-        edges_df = pd.DataFrame(all_edges)
+        # Right-size columns after concatenating: concat of categoricals with different categories falls back to object
+        # Other numeric node columns are missing for some node types, so they stay float
+        nodes_df = pd.concat(node_frames, ignore_index=True).astype(
+            {'network_id': 'int8', **{field: 'category' for field in CATEGORY_FIELDS}}
+        )
+        edges_df = pd.concat(edge_frames, ignore_index=True).astype({'network_id': 'int8', 'edge_type': 'category'})
         
         # Generate summary statistics
         summary_data = []
@@ -393,23 +396,33 @@ class ImprovedStreamlitDatabaseGenerator:
         
         print("\\n💾 Saving Improved Database...")
         
-        # 1. SQLite database (primary format)
-        conn = sqlite3.connect("streamlit_research_database.db")
-        nodes_df.to_sql('nodes', conn, if_exists='replace', index=False)
-        edges_df.to_sql('edges', conn, if_exists='replace', index=False)
-        summary_df.to_sql('network_summary', conn, if_exists='replace', index=False)
-        conn.close()
-        
-        # 2. CSV files (backup format)
-        nodes_df.to_csv('streamlit_nodes.csv', index=False)
-        edges_df.to_csv('streamlit_edges.csv', index=False)
-        summary_df.to_csv('streamlit_summary.csv', index=False)
+        # Lay the networks out once here, so every format carries the node_x/node_y columns the dashboard reads
+        nodes_df = add_layout_columns(nodes_df)
+        
+        # Parquet (the format the dashboard reads first: columnar, keeps dtypes) and CSV files are written on worker threads
+        # while the SQLite database is written here
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            backups = [
+                pool.submit(nodes_df.to_parquet, 'streamlit_nodes.parquet', engine='pyarrow', compression='zstd', index=False),
+                pool.submit(edges_df.to_parquet, 'streamlit_edges.parquet', engine='pyarrow', compression='zstd', index=False),
+                pool.submit(summary_df.to_parquet, 'streamlit_summary.parquet', engine='pyarrow', compression='zstd', index=False),
+                pool.submit(nodes_df.to_csv, 'streamlit_nodes.csv', index=False),
+                pool.submit(edges_df.to_csv, 'streamlit_edges.csv', index=False),
+                pool.submit(summary_df.to_csv, 'streamlit_summary.csv', index=False)
+            ]
+            
+            # 1. SQLite database (read when there are no Parquet files)
+            write_database(nodes_df, edges_df, summary_df)
+            
+            # 2. Wait for the Parquet and CSV backups
+            for backup in backups:
+                backup.result()
         
-        # 3. JSON backup
+        # 3. JSON backup, column-oriented
         database_json = {
-            'nodes': nodes_df.to_dict('records'),
-            'edges': edges_df.to_dict('records'),
-            'summary': summary_df.to_dict('records'),
+            'nodes': frame_columns(nodes_df),
+            'edges': frame_columns(edges_df),
+            'summary': frame_columns(summary_df),
             'metadata': {
                 'generated_at': datetime.now().isoformat(),
                 'version': '2.0_improved',
@@ -419,10 +432,11 @@ class ImprovedStreamlitDatabaseGenerator:
             }
         }
         
-        with open('streamlit_database.json', 'w') as f:
-            json.dump(database_json, f, indent=2)
+        with open('streamlit_database.json', 'wb') as f:
+            f.write(orjson.dumps(database_json, option=orjson.OPT_SERIALIZE_NUMPY))
         
         print("   ✅ SQLite database: streamlit_research_database.db")
+        print("   ✅ Parquet files: streamlit_nodes.parquet, streamlit_edges.parquet, streamlit_summary.parquet")
         print("   ✅ CSV files: streamlit_nodes.csv, streamlit_edges.csv, streamlit_summary.csv")
         print("   ✅ JSON backup: streamlit_database.json")
 
@@ -436,7 +450,7 @@ def main():
     generator = ImprovedStreamlitDatabaseGenerator(seed=42)
     
     # Generate complete database
-    nodes_df, edges_df, summary_df = generator.generate_complete_database()
+    nodes_df, edges_df, summary_df = generator.generate_complete_database(max_workers=len(generator.networks))
     
     # Save in multiple formats
     generator.save_for_streamlit(nodes_df, edges_df, summary_df)
@@ -0,0 +1,76 @@
+# Node layout for the Research Impact Network visualization
+
+import numpy as np
+from config import *
+
+def get_node_positions(network_nodes, network_id):
+    """Calculate node positions based on node type."""
+    node_positions = {}
+    rng = np.random.default_rng(42 + network_id)
+
+    # Position grant
+    grants = network_nodes[network_nodes['node_type'] == NODE_TYPE_GRANT]
+    if not grants.empty:
+        node_positions[grants.iloc[0]['node_id']] = (NODE_POSITIONS_X['grant'], NODE_POSITIONS_Y['grant'])
+
+    # Position publications, cycling through the configured vertical slots
+    publications = network_nodes[network_nodes['node_type'] == NODE_TYPE_PUBLICATION]
+    pub_ids = publications['node_id']
+
+    for prefix, pub_kind in (('PUB_', 'grant_funded_pub'), ('TREAT_PUB_', 'treatment_pathway_pub')):
+        kind_ids = pub_ids[pub_ids.str.startswith(prefix)]
+        pos_y = np.resize(NODE_POSITIONS_Y[pub_kind], len(kind_ids))
+        node_positions.update(zip(kind_ids, ((NODE_POSITIONS_X[pub_kind], y) for y in pos_y)))
+
+    # --- Ecosystem publications positioned by year ---
+    ecosystem_pubs_df = publications[pub_ids.str.startswith('ECO_')]
+
+    if not ecosystem_pubs_df.empty:
+        x_range = [NODE_POSITIONS_X['grant_funded_pub'] + 0.5,
+                   NODE_POSITIONS_X['treatment_pathway_pub'] - 0.5]
+        years = ecosystem_pubs_df['year'].to_numpy(dtype=float)
+        has_year = ~np.isnan(years)
+        num_pubs = len(years)
+
+        # Map publication year to horizontal position between grant and treatment areas,
+        # falling back to a random position for missing years
+        pos_x = np.empty(num_pubs)
+        if has_year.any():
+            pos_x[has_year] = np.interp(years[has_year], [years[has_year].min(), years[has_year].max()], x_range)
+        pos_x[~has_year] = rng.uniform(*x_range, size=num_pubs - has_year.sum())
+
+        # Add small vertical jitter for natural dispersion
+        pos_y = rng.uniform(-1.5, 1.5, size=num_pubs)
+        pos_x += rng.normal(0, 0.2, size=num_pubs)
+        pos_y += rng.normal(0, 0.2, size=num_pubs)
+
+        node_positions.update(zip(ecosystem_pubs_df['node_id'], zip(pos_x, pos_y)))
+
+    # Position treatment
+    treatments = network_nodes[network_nodes['node_type'] == NODE_TYPE_TREATMENT]
+    if not treatments.empty:
+        node_positions[treatments.iloc[0]['node_id']] = (NODE_POSITIONS_X['treatment'], NODE_POSITIONS_Y['treatment'])
+
+    return node_positions
+
+def add_layout_columns(nodes_df):
+    """Store each node's position in node_x/node_y columns so the dashboard can skip the layout step"""
+    nodes_df = nodes_df.copy()
+    nodes_df['node_x'] = np.nan
+    nodes_df['node_y'] = np.nan
+
+    for network_id, network_nodes in nodes_df.groupby('network_id'):
+        node_positions = get_node_positions(network_nodes, int(network_id))
+        positioned = network_nodes['node_id'].isin(node_positions)
+        positions = network_nodes.loc[positioned, 'node_id'].map(node_positions)
+        nodes_df.loc[positions.index, 'node_x'] = [x for x, _ in positions]
+        nodes_df.loc[positions.index, 'node_y'] = [y for _, y in positions]
+
+    return nodes_df
+
+def stored_node_positions(network_nodes):
+    """Read positions saved by add_layout_columns, or None if the data has no stored layout"""
+    if 'node_x' not in network_nodes or network_nodes['node_x'].isna().all():
+        return None
+    positioned = network_nodes[network_nodes['node_x'].notna()]
+    return dict(zip(positioned['node_id'], zip(positioned['node_x'], positioned['node_y'])))
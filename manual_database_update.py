@@ -5,8 +5,16 @@ Updates specific networks with new treatments and diseases
 
 import sqlite3
 import pandas as pd
-import json
+import orjson
 from datetime import datetime
+from config import NODES_QUERY
+from layout import add_layout_columns
+from network_store import edges_query, frame_columns, insert_rows
+
+def replace_rows(conn: sqlite3.Connection, table: str, df: pd.DataFrame):
+    """Replace every row of an existing table with the rows of a DataFrame"""
+    conn.execute(f"DELETE FROM {table}")
+    insert_rows(conn, table, df)
 
 def update_database_manually():
     """Update database with new treatments and diseases"""
@@ -18,8 +26,9 @@ def update_database_manually():
     conn = sqlite3.connect('streamlit_research_database.db')
     
     # Read current data
-    nodes_df = pd.read_sql('SELECT * FROM nodes', conn)
-    edges_df = pd.read_sql('SELECT * FROM edges', conn)
+    nodes_df = pd.read_sql(NODES_QUERY, conn)
+    # Edge types are stored as integer codes (as text in older databases); read them back as names
+    edges_df = pd.read_sql(edges_query(conn), conn)
     summary_df = pd.read_sql('SELECT * FROM network_summary', conn)
     
     print(f"📊 Current Database:")
@@ -53,47 +62,40 @@ def update_database_manually():
     # Update nodes
     print(f"\\n📝 Updating Nodes...")
     
+    # Row positions per (network, node type) and per (network, publication id prefix), grouped once up front
+    # (read_sql gives a RangeIndex, so positions double as .loc labels)
+    node_rows = nodes_df.groupby(['network_id', 'node_type'], sort=False).indices
+    pub_prefix = nodes_df['node_id'].str.extract(r'^(PUB|TREAT_PUB|ECO)_', expand=False)
+    pub_rows = nodes_df.groupby([nodes_df['network_id'], pub_prefix], sort=False).indices
+    
     for net_id, updates in network_updates.items():
         # Update grant nodes
-        grant_mask = (nodes_df['network_id'] == net_id) & (nodes_df['node_type'] == 'grant')
-        if grant_mask.any():
-            nodes_df.loc[grant_mask, 'disease'] = updates['disease']
-            nodes_df.loc[grant_mask, 'treatment_name'] = updates['treatment_name']
-            nodes_df.loc[grant_mask, 'approval_year'] = updates['approval_year']
-            nodes_df.loc[grant_mask, 'title'] = f"{updates['grant_focus']} Initiative"
+        if (net_id, 'grant') in node_rows:
+            nodes_df.loc[node_rows[(net_id, 'grant')], ['disease', 'treatment_name', 'approval_year', 'title']] = [
+                updates['disease'], updates['treatment_name'], updates['approval_year'], f"{updates['grant_focus']} Initiative"
+            ]
             print(f"   ✅ Updated grant node for Network {net_id}")
         
         # Update treatment nodes
-        treatment_mask = (nodes_df['network_id'] == net_id) & (nodes_df['node_type'] == 'treatment')
-        if treatment_mask.any():
-            nodes_df.loc[treatment_mask, 'treatment_name'] = updates['treatment_name']
-            nodes_df.loc[treatment_mask, 'disease'] = updates['disease']
-            nodes_df.loc[treatment_mask, 'approval_year'] = updates['approval_year']
+        if (net_id, 'treatment') in node_rows:
+            nodes_df.loc[node_rows[(net_id, 'treatment')], ['treatment_name', 'disease', 'approval_year']] = [
+                updates['treatment_name'], updates['disease'], updates['approval_year']
+            ]
             print(f"   ✅ Updated treatment node for Network {net_id}")
         
         # Update publication titles to reflect new disease/treatment
-        pub_mask = (nodes_df['network_id'] == net_id) & (nodes_df['node_type'] == 'publication')
-        if pub_mask.any():
+        if (net_id, 'publication') in node_rows:
             # Update titles for grant-funded publications
-            grant_pub_mask = pub_mask & (nodes_df['node_id'].str.startswith('PUB_'))
-            if grant_pub_mask.any():
-                nodes_df.loc[grant_pub_mask, 'title'] = nodes_df.loc[grant_pub_mask, 'title'].apply(
-                    lambda x: f"Molecular mechanisms of {updates['keywords'][0]} in {updates['disease'].lower()}"
-                )
+            if (net_id, 'PUB') in pub_rows:
+                nodes_df.loc[pub_rows[(net_id, 'PUB')], 'title'] = f"Molecular mechanisms of {updates['keywords'][0]} in {updates['disease'].lower()}"
             
             # Update titles for treatment publications
-            treat_pub_mask = pub_mask & (nodes_df['node_id'].str.startswith('TREAT_PUB_'))
-            if treat_pub_mask.any():
-                nodes_df.loc[treat_pub_mask, 'title'] = nodes_df.loc[treat_pub_mask, 'title'].apply(
-                    lambda x: f"Clinical trial results for {updates['disease']} treatment using {updates['treatment_name']}"
-                )
+            if (net_id, 'TREAT_PUB') in pub_rows:
+                nodes_df.loc[pub_rows[(net_id, 'TREAT_PUB')], 'title'] = f"Clinical trial results for {updates['disease']} treatment using {updates['treatment_name']}"
             
             # Update titles for ecosystem publications
-            eco_pub_mask = pub_mask & (nodes_df['node_id'].str.startswith('ECO_'))
-            if eco_pub_mask.any():
-                nodes_df.loc[eco_pub_mask, 'title'] = nodes_df.loc[eco_pub_mask, 'title'].apply(
-                    lambda x: f"Translational {updates['keywords'][0]} research: From bench to bedside"
-                )
+            if (net_id, 'ECO') in pub_rows:
+                nodes_df.loc[pub_rows[(net_id, 'ECO')], 'title'] = f"Translational {updates['keywords'][0]} research: From bench to bedside"
             
             print(f"   ✅ Updated publication titles for Network {net_id}")
     
@@ -111,22 +113,39 @@ def update_database_manually():
     # Save updated data back to database
     print(f"\\n💾 Saving Updated Database...")
     
-    nodes_df.to_sql('nodes', conn, if_exists='replace', index=False)
-    edges_df.to_sql('edges', conn, if_exists='replace', index=False)  # Edges remain unchanged
-    summary_df.to_sql('network_summary', conn, if_exists='replace', index=False)
-    
-    conn.close()
-    
-    # Update CSV files
+    # Rows are replaced in one transaction, keeping the generator's table definitions
+    # Edges remain unchanged, so the coded edges table and its index are left as they are
+    conn.isolation_level = None
+    conn.executescript("PRAGMA busy_timeout=5000; PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY;")
+    try:
+        conn.execute("BEGIN")
+        replace_rows(conn, 'nodes', nodes_df)
+        replace_rows(conn, 'network_summary', summary_df)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    
+    # Databases from before the generators stored a layout have no node_x/node_y columns;
+    # add them so the exported files carry the columns the dashboard reads
+    if 'node_x' not in nodes_df:
+        nodes_df = add_layout_columns(nodes_df)
+    
+    # Update Parquet and CSV files
+    nodes_df.to_parquet('streamlit_nodes.parquet', engine='pyarrow', compression='zstd', index=False)
+    edges_df.to_parquet('streamlit_edges.parquet', engine='pyarrow', compression='zstd', index=False)
+    summary_df.to_parquet('streamlit_summary.parquet', engine='pyarrow', compression='zstd', index=False)
     nodes_df.to_csv('streamlit_nodes.csv', index=False)
     edges_df.to_csv('streamlit_edges.csv', index=False)
     summary_df.to_csv('streamlit_summary.csv', index=False)
     
-    # Update JSON backup
+    # Update JSON backup, column-oriented like the generator's
     database_json = {
-        'nodes': nodes_df.to_dict('records'),
-        'edges': edges_df.to_dict('records'),
-        'summary': summary_df.to_dict('records'),
+        'nodes': frame_columns(nodes_df),
+        'edges': frame_columns(edges_df),
+        'summary': frame_columns(summary_df),
         'metadata': {
             'generated_at': datetime.now().isoformat(),
             'version': '3.1_manual_update',
@@ -141,11 +160,11 @@ def update_database_manually():
         }
     }
     
-    with open('streamlit_database.json', 'w') as f:
-        json.dump(database_json, f, indent=2)
+    with open('streamlit_database.json', 'wb') as f:
+        f.write(orjson.dumps(database_json, option=orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"   ✅ SQLite database updated")
-    print(f"   ✅ CSV files updated")
+    print(f"   ✅ Parquet and CSV files updated")
     print(f"   ✅ JSON backup updated")
     
     # Display final summary
@@ -0,0 +1,165 @@
+# Network frames and SQLite storage shared by the database generators
+
+import copy
+import sqlite3
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple
+from config import DATABASE_PATH, EDGE_TYPE_CITES, EDGE_TYPE_LEADS_TO_TREATMENT, EDGES_QUERY, LEGACY_EDGES_QUERY
+
+# Node table columns in order; nodes that lack a field get NaN in that column
+NODE_FIELDS = [
+    'node_id', 'node_type', 'network_id', 'grant_id', 'funding_amount', 'year', 'pi_name', 'title',
+    'disease', 'treatment_name', 'approval_year', 'fda_approved', 'pmid', 'authors', 'journal',
+    'funded_by_grant', 'treatment_related', 'citation_count'
+]
+
+# Low-cardinality string columns, stored as integer codes in memory
+CATEGORY_FIELDS = ['node_type', 'journal', 'disease', 'treatment_name']
+
+# Explicit SQLite schema, recreated on every save, so inserts skip pandas' dtype inference
+SQLITE_SCHEMA = """
+DROP TABLE IF EXISTS nodes;
+DROP TABLE IF EXISTS edges;
+DROP TABLE IF EXISTS edge_types;
+DROP TABLE IF EXISTS network_summary;
+DROP TABLE IF EXISTS metrics;
+
+CREATE TABLE nodes (
+    node_id TEXT PRIMARY KEY,
+    node_type TEXT,
+    network_id INTEGER,
+    grant_id TEXT,
+    funding_amount REAL,
+    year REAL,
+    pi_name TEXT,
+    title TEXT,
+    disease TEXT,
+    treatment_name TEXT,
+    approval_year REAL,
+    fda_approved REAL,
+    pmid REAL,
+    authors TEXT,
+    journal TEXT,
+    funded_by_grant REAL,
+    treatment_related REAL,
+    citation_count REAL,
+    node_x REAL,
+    node_y REAL
+) WITHOUT ROWID;
+
+CREATE TABLE edge_types (
+    edge_type_id INTEGER PRIMARY KEY,
+    edge_type TEXT
+);
+
+CREATE TABLE edges (
+    source_id TEXT,
+    target_id TEXT,
+    edge_type_id INTEGER REFERENCES edge_types (edge_type_id),
+    network_id INTEGER
+);
+
+CREATE TABLE network_summary (
+    network_id INTEGER,
+    disease TEXT,
+    treatment_name TEXT,
+    grant_id TEXT,
+    grant_year INTEGER,
+    approval_year INTEGER,
+    funding_amount INTEGER,
+    total_publications INTEGER,
+    research_duration INTEGER,
+    guaranteed_chains INTEGER
+);
+
+CREATE TABLE metrics (
+    total_nodes INTEGER,
+    total_connections INTEGER,
+    treatment_pathways INTEGER,
+    citation_edges INTEGER,
+    total_funding INTEGER
+);
+"""
+
+def new_edge_columns() -> Dict[str, list]:
+    """Empty per-column buffers for a network's edges"""
+    return {"source_id": [], "target_id": [], "edge_type": []}
+
+def append_edge(edges: Dict[str, list], source_id: str, target_id: str, edge_type: str):
+    """Append one edge to per-column edge buffers"""
+    edges["source_id"].append(source_id)
+    edges["target_id"].append(target_id)
+    edges["edge_type"].append(edge_type)
+
+def network_frames(nodes: List[Dict], edges: Dict[str, list], network_id: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Build one network's node and edge frames column by column"""
+    nodes_df = pd.DataFrame({field: [node.get(field) for node in nodes] for field in NODE_FIELDS})
+    edges_df = pd.DataFrame({**edges, "network_id": network_id})
+    return nodes_df, edges_df
+
+def generate_network(generator: Any, seed: np.random.SeedSequence,
+                     network_config: Dict, network_id: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Generate one network with its own RNG; module-level so worker processes can run it"""
+    generator = copy.copy(generator)
+    generator.rng = np.random.default_rng(seed)
+    return generator.generate_single_network(network_config, network_id)
+
+def frame_columns(df: pd.DataFrame) -> Dict[str, list]:
+    """Column-oriented JSON view of a DataFrame ({column: [values]}); NaN becomes null"""
+    return {column: df[column].to_numpy().tolist() for column in df.columns}
+
+def insert_rows(conn: sqlite3.Connection, table: str, df: pd.DataFrame):
+    """Bulk-insert a DataFrame into a table created by SQLITE_SCHEMA; columns it lacks are left NULL"""
+    columns = ', '.join(df.columns)
+    placeholders = ', '.join('?' * len(df.columns))
+    conn.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                     df.itertuples(index=False, name=None))
+
+def write_database(nodes_df: pd.DataFrame, edges_df: pd.DataFrame, summary_df: pd.DataFrame,
+                   path: str = DATABASE_PATH):
+    """Rebuild the SQLite database in one transaction so readers never see it half-written"""
+    # Dashboard statistics, computed once here rather than on every Streamlit rerun
+    metrics_df = pd.DataFrame([{
+        'total_nodes': len(nodes_df),
+        'total_connections': len(edges_df),
+        'treatment_pathways': int((edges_df['edge_type'] == EDGE_TYPE_LEADS_TO_TREATMENT).sum()),
+        'citation_edges': int((edges_df['edge_type'] == EDGE_TYPE_CITES).sum()),
+        'total_funding': int(summary_df['funding_amount'].sum())
+    }])
+
+    # Edge types are stored as small integer codes plus an edge_types lookup table
+    edge_types = edges_df['edge_type'].astype('category')
+    edge_types_df = pd.DataFrame({
+        'edge_type_id': range(len(edge_types.cat.categories)),
+        'edge_type': edge_types.cat.categories
+    })
+    coded_edges_df = pd.DataFrame({
+        'source_id': edges_df['source_id'],
+        'target_id': edges_df['target_id'],
+        'edge_type_id': edge_types.cat.codes,
+        'network_id': edges_df['network_id']
+    })
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript("PRAGMA busy_timeout=5000; PRAGMA synchronous=OFF; PRAGMA journal_mode=MEMORY;")
+    try:
+        conn.executescript("BEGIN;" + SQLITE_SCHEMA)
+        insert_rows(conn, 'nodes', nodes_df)
+        insert_rows(conn, 'edge_types', edge_types_df)
+        insert_rows(conn, 'edges', coded_edges_df)
+        insert_rows(conn, 'network_summary', summary_df)
+        insert_rows(conn, 'metrics', metrics_df)
+        conn.execute("CREATE INDEX idx_edges_network_type ON edges(network_id, edge_type_id, source_id, target_id)")
+        conn.execute("ANALYZE")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def edges_query(conn: sqlite3.Connection) -> str:
+    """Query reading edges with their type names, for coded databases and older ones without edge_types"""
+    coded = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'edge_types'").fetchone()
+    return EDGES_QUERY if coded else LEGACY_EDGES_QUERY
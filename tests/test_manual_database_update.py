@@ -0,0 +1,30 @@
+import sqlite3
+
+import pandas as pd
+
+from config import DATABASE_PATH, NODE_COLUMNS, NODES_PARQUET_PATH, NODES_CSV_PATH
+from enhanced_network_generator import EnhancedStreamlitDatabaseGenerator
+from manual_database_update import update_database_manually
+
+
+def write_legacy_database(path):
+    """Write a database the way the generators did before edge_types and stored layouts"""
+    nodes_df, edges_df, summary_df = EnhancedStreamlitDatabaseGenerator(seed=42).generate_complete_database()
+    with sqlite3.connect(path) as conn:
+        nodes_df.to_sql('nodes', conn, index=False)
+        edges_df.to_sql('edges', conn, index=False)
+        summary_df.to_sql('network_summary', conn, index=False)
+    return nodes_df
+
+
+def test_legacy_database_exports_layout_columns(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generated_nodes = write_legacy_database(DATABASE_PATH)
+
+    update_database_manually()
+
+    # The dashboard reads exactly these columns, so the Parquet file must have every one of them
+    nodes_df = pd.read_parquet(NODES_PARQUET_PATH, columns=NODE_COLUMNS)
+    assert nodes_df['node_x'].notna().any()
+    assert nodes_df['node_id'].tolist() == generated_nodes['node_id'].tolist()
+    assert {'node_x', 'node_y'} <= set(pd.read_csv(NODES_CSV_PATH).columns)